@@ -6,24 +6,17 @@ Collects file sizes, row counts, and metadata from generated cache files
 and sends a formatted report to a Telegram chat.
 """
 
-import html
-import json
 import os
 import sys
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 from typing import Any
 
+import orjson
 import pandas as pd
 import requests
 
 
-def get_file_size_mb(file_path: str) -> float:
-    """Get file size in MB."""
-    if not os.path.exists(file_path):
-        return 0.0
-    return os.path.getsize(file_path) / (1024 * 1024)
-
-
 def get_parquet_row_count(file_path: str) -> int:
     """Get row count from parquet file."""
     if not os.path.exists(file_path):
@@ -36,13 +29,12 @@ def get_parquet_row_count(file_path: str) -> int:
         return 0
 
 
-def load_meta_json(file_path: str) -> dict[str, Any]:
+def load_meta_json(file_path: str | Path) -> dict[str, Any]:
     """Load metadata from JSON file."""
     if not os.path.exists(file_path):
         return {}
     try:
-        with open(file_path) as f:
-            return json.load(f)
+        return orjson.loads(Path(file_path).read_bytes())
     except Exception as e:
         print(f"Warning: Could not load metadata from {file_path}: {e}", file=sys.stderr)
         return {}
@@ -60,125 +52,151 @@ def format_number(num: int) -> str:
     return f"{num:,}"
 
 
-def build_validation_failure_message(cache_dir: str = "cache", validation_errors: list[str] = None) -> str:
-    """Build Telegram message for validation failure."""
-    message_lines = ["❌ <b>Feature Cache Validation Failed</b>", ""]
-    message_lines.append("<b>⚠️ Release Blocked - Data Quality Issues Detected</b>")
-    message_lines.append("")
-    
+# Telegram's HTML parse mode only requires &, < and > to be escaped;
+# str.translate does it in a single pass.
+_HTML_ESCAPE_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;"})
+
+# Cache files reported on (shared by success and failure reports)
+_CACHE_FILES = (
+    ("krx_stock_master.parquet", "KRX Stock Master"),
+    ("korea_universe_feature_frame.parquet", "Universe Features"),
+    ("korea_industry_feature_frame.parquet", "Industry Features"),
+)
+_UNIVERSE_META = "korea_universe_feature_frame.meta.json"
+_INDUSTRY_META = "korea_industry_feature_frame.meta.json"
+
+_VALIDATION_FAILURE_TEMPLATE = (
+    "❌ <b>Feature Cache Validation Failed</b>\n"
+    "\n"
+    "<b>⚠️ Release Blocked - Data Quality Issues Detected</b>\n"
+    "\n"
+    "{errors_block}"
+    "<b>📊 Generated Files:</b>\n"
+    "{files_block}"
+    "\n"
+    "{ticker_block}"
+    "⛔ <b>Action Required:</b> Fix data quality issues before releasing."
+)
+
+_RELEASE_REPORT_TEMPLATE = (
+    "🎉 <b>Feature Cache Release Report</b>\n"
+    "\n"
+    "<b>📦 Files:</b>\n"
+    "{files_block}"
+    "\n"
+    "{universe_block}"
+    "{industry_block}"
+    "✅ Release ready for distribution!"
+)
+
+
+def _section(header: str, lines: Iterable[str]) -> str:
+    """Render a titled message section followed by a blank line."""
+    return header + "\n" + "".join(f"{line}\n" for line in lines) + "\n"
+
+
+def _scan_cache_dir(cache_dir: str) -> dict[str, os.DirEntry]:
+    """Map file name -> DirEntry for regular files in cache_dir (one readdir)."""
+    try:
+        with os.scandir(cache_dir) as it:
+            return {entry.name: entry for entry in it if entry.is_file()}
+    except FileNotFoundError:
+        return {}
+
+
+def _iter_file_lines(cache_dir: str, include_row_counts: bool = True) -> Iterator[str]:
+    """Yield one line per generated cache file (size and, optionally, row count)."""
+    entries = _scan_cache_dir(cache_dir)
+    for filename, label in _CACHE_FILES:
+        entry = entries.get(filename)
+        if entry is None:
+            continue
+        size_str = format_filesize(entry.stat().st_size / (1024 * 1024))
+        row_count = get_parquet_row_count(entry.path) if include_row_counts else 0
+        if row_count > 0:
+            yield f"  • {label}: {size_str} ({format_number(row_count)} rows)"
+        else:
+            yield f"  • {label}: {size_str}"
+
+
+def _iter_universe_lines(universe_meta: dict[str, Any]) -> Iterator[str]:
+    """Yield universe feature metadata lines."""
+    if "date_range" in universe_meta:
+        date_range = universe_meta.get("date_range", {})
+        yield f"  • Date range: {date_range.get('start')} ~ {date_range.get('end')}"
+    if "ticker_count" in universe_meta:
+        yield f"  • Tickers: {format_number(universe_meta.get('ticker_count'))}"
+    if "successful_ticker_count" in universe_meta:
+        success_count = universe_meta.get("successful_ticker_count")
+        total_count = universe_meta.get("ticker_count", 1)
+        success_rate = (success_count / total_count * 100) if total_count > 0 else 0
+        yield f"  • Successful: {format_number(success_count)}/{format_number(total_count)} ({success_rate:.1f}%)"
+    if "columns" in universe_meta:
+        yield f"  • Columns: {len(universe_meta.get('columns', []))}"
+
+
+def _iter_industry_lines(industry_meta: dict[str, Any]) -> Iterator[str]:
+    """Yield industry feature metadata lines."""
+    if "date_range" in industry_meta:
+        date_range = industry_meta.get("date_range", {})
+        yield f"  • Date range: {date_range.get('start')} ~ {date_range.get('end')}"
+    if "industry_count" in industry_meta:
+        industry_count = industry_meta.get("industry_count")
+        if isinstance(industry_count, dict):
+            yield f"  • Industries: Large={industry_count.get('large', 0)}, Mid={industry_count.get('mid', 0)}, Small={industry_count.get('small', 0)}"
+        else:
+            yield f"  • Industries: {format_number(industry_count)}"
+    if "columns" in industry_meta:
+        yield f"  • Columns: {len(industry_meta.get('columns', []))}"
+
+
+def build_validation_failure_message(
+    cache_dir: str = "cache",
+    validation_errors: list[str] = None,
+    include_row_counts: bool = True,
+) -> str:
+    """Build Telegram message for validation failure.
+
+    Set include_row_counts=False to skip reading parquet row counts
+    (the most expensive part of the report).
+    """
     # List validation errors with proper HTML escaping
+    errors_block = ""
     if validation_errors:
-        message_lines.append("<b>🔍 Validation Errors:</b>")
-        for i, error in enumerate(validation_errors, 1):
-            # Use html.escape for proper HTML escaping
-            error_escaped = html.escape(error)
-            message_lines.append(f"  {i}. {error_escaped}")
-        message_lines.append("")
-    
-    # Show file statistics for context
-    message_lines.append("<b>📊 Generated Files:</b>")
-    files_info = [
-        ("krx_stock_master.parquet", "KRX Stock Master"),
-        ("korea_universe_feature_frame.parquet", "Universe Features"),
-        ("korea_industry_feature_frame.parquet", "Industry Features"),
-    ]
-    
-    for filename, label in files_info:
-        file_path = os.path.join(cache_dir, filename)
-        if os.path.exists(file_path):
-            size_mb = get_file_size_mb(file_path)
-            row_count = get_parquet_row_count(file_path)
-            size_str = format_filesize(size_mb)
-            if row_count > 0:
-                message_lines.append(f"  • {label}: {size_str} ({format_number(row_count)} rows)")
-            else:
-                message_lines.append(f"  • {label}: {size_str}")
-    
-    message_lines.append("")
-    
+        errors_block = _section(
+            "<b>🔍 Validation Errors:</b>",
+            (f"  {i}. {error.translate(_HTML_ESCAPE_TABLE)}" for i, error in enumerate(validation_errors, 1)),
+        )
+
     # Show ticker count if available in metadata
-    universe_meta_path = os.path.join(cache_dir, "korea_universe_feature_frame.meta.json")
-    universe_meta = load_meta_json(universe_meta_path)
+    ticker_block = ""
+    universe_meta = load_meta_json(Path(cache_dir) / _UNIVERSE_META)
     if universe_meta and "ticker_count" in universe_meta:
-        ticker_count = universe_meta.get("ticker_count")
-        message_lines.append(f"<b>📈 Ticker Count:</b> {format_number(ticker_count)}")
-        message_lines.append("")
-    
-    message_lines.append("⛔ <b>Action Required:</b> Fix data quality issues before releasing.")
-    
-    return "\n".join(message_lines)
-
-
-def build_telegram_message(cache_dir: str = "cache") -> str:
-    """Build Telegram message with release statistics."""
-    message_lines = ["🎉 <b>Feature Cache Release Report</b>", ""]
-
-    # File statistics
-    message_lines.append("<b>📦 Files:</b>")
-
-    files_info = [
-        ("krx_stock_master.parquet", "KRX Stock Master"),
-        ("korea_universe_feature_frame.parquet", "Universe Features"),
-        ("korea_industry_feature_frame.parquet", "Industry Features"),
-    ]
-
-    for filename, label in files_info:
-        file_path = os.path.join(cache_dir, filename)
-        if os.path.exists(file_path):
-            size_mb = get_file_size_mb(file_path)
-            row_count = get_parquet_row_count(file_path)
-            size_str = format_filesize(size_mb)
-            if row_count > 0:
-                message_lines.append(f"  • {label}: {size_str} ({format_number(row_count)} rows)")
-            else:
-                message_lines.append(f"  • {label}: {size_str}")
-
-    message_lines.append("")
-
-    # Universe feature metadata
-    universe_meta_path = os.path.join(cache_dir, "korea_universe_feature_frame.meta.json")
-    universe_meta = load_meta_json(universe_meta_path)
-    if universe_meta:
-        message_lines.append("<b>🌐 Universe Features:</b>")
-        if "date_range" in universe_meta:
-            date_range = universe_meta.get("date_range", {})
-            message_lines.append(f"  • Date range: {date_range.get('start')} ~ {date_range.get('end')}")
-        if "ticker_count" in universe_meta:
-            ticker_count = universe_meta.get("ticker_count")
-            message_lines.append(f"  • Tickers: {format_number(ticker_count)}")
-        if "successful_ticker_count" in universe_meta:
-            success_count = universe_meta.get("successful_ticker_count")
-            total_count = universe_meta.get("ticker_count", 1)
-            success_rate = (success_count / total_count * 100) if total_count > 0 else 0
-            message_lines.append(f"  • Successful: {format_number(success_count)}/{format_number(total_count)} ({success_rate:.1f}%)")
-        if "columns" in universe_meta:
-            col_count = len(universe_meta.get("columns", []))
-            message_lines.append(f"  • Columns: {col_count}")
-        message_lines.append("")
-
-    # Industry feature metadata
-    industry_meta_path = os.path.join(cache_dir, "korea_industry_feature_frame.meta.json")
-    industry_meta = load_meta_json(industry_meta_path)
-    if industry_meta:
-        message_lines.append("<b>🏭 Industry Features:</b>")
-        if "date_range" in industry_meta:
-            date_range = industry_meta.get("date_range", {})
-            message_lines.append(f"  • Date range: {date_range.get('start')} ~ {date_range.get('end')}")
-        if "industry_count" in industry_meta:
-            industry_count = industry_meta.get("industry_count")
-            if isinstance(industry_count, dict):
-                message_lines.append(f"  • Industries: Large={industry_count.get('large', 0)}, Mid={industry_count.get('mid', 0)}, Small={industry_count.get('small', 0)}")
-            else:
-                message_lines.append(f"  • Industries: {format_number(industry_count)}")
-        if "columns" in industry_meta:
-            col_count = len(industry_meta.get("columns", []))
-            message_lines.append(f"  • Columns: {col_count}")
-        message_lines.append("")
-
-    # Summary
-    message_lines.append("✅ Release ready for distribution!")
-
-    return "\n".join(message_lines)
+        ticker_block = f"<b>📈 Ticker Count:</b> {format_number(universe_meta['ticker_count'])}\n\n"
+
+    return _VALIDATION_FAILURE_TEMPLATE.format_map({
+        "errors_block": errors_block,
+        "files_block": "".join(f"{line}\n" for line in _iter_file_lines(cache_dir, include_row_counts)),
+        "ticker_block": ticker_block,
+    })
+
+
+def build_telegram_message(cache_dir: str = "cache", include_row_counts: bool = True) -> str:
+    """Build Telegram message with release statistics.
+
+    Set include_row_counts=False to skip reading parquet row counts
+    (the most expensive part of the report).
+    """
+    universe_meta = load_meta_json(Path(cache_dir) / _UNIVERSE_META)
+    industry_meta = load_meta_json(Path(cache_dir) / _INDUSTRY_META)
+    universe_block = _section("<b>🌐 Universe Features:</b>", _iter_universe_lines(universe_meta)) if universe_meta else ""
+    industry_block = _section("<b>🏭 Industry Features:</b>", _iter_industry_lines(industry_meta)) if industry_meta else ""
+
+    return _RELEASE_REPORT_TEMPLATE.format_map({
+        "files_block": "".join(f"{line}\n" for line in _iter_file_lines(cache_dir, include_row_counts)),
+        "universe_block": universe_block,
+        "industry_block": industry_block,
+    })
 
 
 def send_telegram_message(message: str, bot_token: str, chat_id: str) -> bool:
@@ -218,6 +236,7 @@ if __name__ == "__main__":
     parser.add_argument("--dry-run", action="store_true", help="Print message without sending")
     parser.add_argument("--validation-failed", action="store_true", help="Send validation failure message")
     parser.add_argument("--validation-errors", help="Validation error messages (one per line)")
+    parser.add_argument("--skip-row-counts", action="store_true", help="Do not read parquet row counts")
 
     args = parser.parse_args()
 
@@ -231,9 +250,11 @@ if __name__ == "__main__":
         validation_errors = []
         if args.validation_errors:
             validation_errors = args.validation_errors.strip().split("\n")
-        message = build_validation_failure_message(args.cache_dir, validation_errors)
+        message = build_validation_failure_message(
+            args.cache_dir, validation_errors, include_row_counts=not args.skip_row_counts
+        )
     else:
-        message = build_telegram_message(args.cache_dir)
+        message = build_telegram_message(args.cache_dir, include_row_counts=not args.skip_row_counts)
     
     print(message)
 
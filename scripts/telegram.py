@@ -1,9 +1,15 @@
+import mimetypes
 import os
-from typing import Optional
+from typing import BinaryIO, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
 from dotenv import load_dotenv
 
+# .env 는 모듈 import 시 한 번만 읽습니다 (인스턴스마다 다시 파싱하지 않도록).
+load_dotenv()
+
 
 class TelegramSender:
     """Telegram messaging wrapper with optional strict error handling.
@@ -13,9 +19,11 @@ class TelegramSender:
     """
 
     def __init__(self, bot_token: Optional[str] = None, chat_id: Optional[str] = None):
-        load_dotenv()
         self.bot_token = bot_token or os.getenv("TELEGRAM_BOT_TOKEN")
         self.chat_id = chat_id or os.getenv("TELEGRAM_CHAT_ID_TEST")
+        # 연속 전송(메시지 + 사진 + 문서) 시 TLS 연결을 재사용하기 위한 세션
+        self._session = requests.Session()
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
 
     def _ensure_credentials(self) -> bool:
         if not self.bot_token or not self.chat_id:
@@ -23,6 +31,23 @@ class TelegramSender:
             return False
         return True
 
+    def _multipart_encoder(
+        self,
+        field: str,
+        file_path: str,
+        file_obj: BinaryIO,
+        caption: Optional[str],
+    ) -> MultipartEncoder:
+        """파일을 메모리에 모두 올리지 않고 청크 단위로 스트리밍 업로드하는 multipart body."""
+        content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+        fields = {
+            "chat_id": str(self.chat_id),
+            field: (os.path.basename(file_path), file_obj, content_type),
+        }
+        if caption:
+            fields["caption"] = caption
+        return MultipartEncoder(fields=fields)
+
     def send_message(
         self,
         text: str,
@@ -44,7 +69,7 @@ class TelegramSender:
             data["parse_mode"] = parse_mode
 
         try:
-            response = requests.post(url, data=data, timeout=30)
+            response = self._session.post(url, data=data, timeout=30)
             response.raise_for_status()
         except requests.RequestException as exc:
             response_text = ""
@@ -75,11 +100,13 @@ class TelegramSender:
         url = f"https://api.telegram.org/bot{self.bot_token}/sendPhoto"
         try:
             with open(file_path, "rb") as f:
-                files = {"photo": f}
-                data = {"chat_id": self.chat_id}
-                if caption:
-                    data["caption"] = caption
-                response = requests.post(url, data=data, files=files, timeout=30)
+                encoder = self._multipart_encoder("photo", file_path, f, caption)
+                response = self._session.post(
+                    url,
+                    data=encoder,
+                    headers={"Content-Type": encoder.content_type},
+                    timeout=30,
+                )
                 response.raise_for_status()
         except (OSError, requests.RequestException) as exc:
             response_text = ""
@@ -110,11 +137,13 @@ class TelegramSender:
         url = f"https://api.telegram.org/bot{self.bot_token}/sendDocument"
         try:
             with open(file_path, "rb") as f:
-                files = {"document": f}
-                data = {"chat_id": self.chat_id}
-                if caption:
-                    data["caption"] = caption
-                response = requests.post(url, data=data, files=files, timeout=30)
+                encoder = self._multipart_encoder("document", file_path, f, caption)
+                response = self._session.post(
+                    url,
+                    data=encoder,
+                    headers={"Content-Type": encoder.content_type},
+                    timeout=30,
+                )
                 response.raise_for_status()
         except (OSError, requests.RequestException) as exc:
             response_text = ""
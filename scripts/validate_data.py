@@ -15,19 +15,30 @@ Exit codes:
 Validation errors are written to stderr for capture by workflow.
 """
 import argparse
+import functools
 import html
-import json
 import logging
+import os
+import stat
 import sys
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
+import orjson
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 
 logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
 
+# Tail bytes read in one go when opening a parquet footer; covers the
+# footer of all cache files we produce, so no follow-up reads are needed.
+FOOTER_PREFETCH_BYTES = 256 * 1024
+
 
 class ValidationError(Exception):
     """Raised when a validation check fails."""
@@ -42,12 +53,15 @@ def validate_file_exists(path: Path, file_type: str, min_size_mb: float | None =
         file_type: Description of the file type for error messages
         min_size_mb: Minimum required file size in MB (optional, exclusive)
     """
-    if not path.exists():
+    # Single stat() call covers existence, file type and size
+    try:
+        st = path.stat()
+    except (FileNotFoundError, NotADirectoryError):
         raise ValidationError(f"{file_type} file not found: {path}")
-    if not path.is_file():
+    if not stat.S_ISREG(st.st_mode):
         raise ValidationError(f"{file_type} path is not a file: {path}")
     
-    file_size_bytes = path.stat().st_size
+    file_size_bytes = st.st_size
     file_size_mb = file_size_bytes / 1024 / 1024
     
     if file_size_bytes == 0:
@@ -67,9 +81,8 @@ def validate_metadata_status(meta_path: Path) -> dict[str, Any]:
     validate_file_exists(meta_path, "Metadata")
     
     try:
-        with open(meta_path) as f:
-            meta = json.load(f)
-    except json.JSONDecodeError as e:
+        meta = orjson.loads(meta_path.read_bytes())
+    except orjson.JSONDecodeError as e:
         raise ValidationError(f"Metadata JSON is invalid: {e}")
     
     # Check run status
@@ -141,8 +154,67 @@ def validate_data_completeness(df: pd.DataFrame, meta: dict[str, Any]) -> None:
     logger.info(f"✓ Data completeness: {actual_rows} rows, {actual_tickers} unique tickers")
 
 
-def validate_data_quality(df: pd.DataFrame) -> None:
-    """Validate data quality (nulls, value ranges)."""
+def _read_parquet_metadata(path: Path) -> pq.FileMetaData:
+    """Return parquet footer metadata, parsed once per file version.
+    
+    All metadata-based checks go through here so the footer is read and
+    deserialized only once per run. The cache key includes mtime and size
+    so a rewritten file is re-read.
+    """
+    st = path.stat()
+    return _cached_parquet_metadata(str(path), st.st_mtime_ns, st.st_size)
+
+
+@functools.lru_cache(maxsize=8)
+def _cached_parquet_metadata(path: str, mtime_ns: int, size: int) -> pq.FileMetaData:
+    """Read parquet footer metadata with a single tail read.
+    
+    Falls back to a regular open when the footer is larger than
+    FOOTER_PREFETCH_BYTES.
+    """
+    with open(path, "rb") as f:
+        f.seek(-min(size, FOOTER_PREFETCH_BYTES), os.SEEK_END)
+        tail = f.read()
+    
+    footer_len = int.from_bytes(tail[-8:-4], "little")
+    if tail[-4:] != b"PAR1" or footer_len + 8 > len(tail):
+        return pq.ParquetFile(path).metadata
+    return pq.ParquetFile(pa.BufferReader(tail)).metadata
+
+
+def _column_min_max(path: Path, column: str) -> tuple[Any, Any] | None:
+    """Reduce per-row-group parquet statistics of a column to (min, max).
+    
+    Returns None when the column is missing or any row group lacks min/max
+    statistics, in which case callers should fall back to scanning the data.
+    """
+    metadata = _read_parquet_metadata(path)
+    names = metadata.schema.names
+    if column not in names:
+        return None
+    col_idx = names.index(column)
+    
+    col_min, col_max = None, None
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(col_idx).statistics
+        if stats is None or not stats.has_min_max:
+            return None
+        col_min = stats.min if col_min is None else min(col_min, stats.min)
+        col_max = stats.max if col_max is None else max(col_max, stats.max)
+    if col_min is None:
+        return None
+    return col_min, col_max
+
+
+def validate_data_quality(df: pd.DataFrame, path: Path | None = None) -> None:
+    """Validate data quality (nulls, value ranges).
+    
+    Args:
+        df: Universe feature frame
+        path: Parquet file the frame was read from (optional). When given,
+            Close min/max and Volume sign are taken from row-group statistics
+            where available instead of scanning the columns.
+    """
     # Check for excessive nulls in critical columns
     critical_columns = ["Date", "Ticker", "Close"]
     for col in critical_columns:
@@ -158,8 +230,12 @@ def validate_data_quality(df: pd.DataFrame) -> None:
     
     # Check for reasonable value ranges in OHLCV
     if "Close" in df.columns:
-        close_min = df["Close"].min()
-        close_max = df["Close"].max()
+        close_stats = _column_min_max(path, "Close") if path is not None else None
+        if close_stats is not None:
+            close_min, close_max = close_stats
+        else:
+            close_min = df["Close"].min()
+            close_max = df["Close"].max()
         if close_min <= 0:
             raise ValidationError(f"Close prices have invalid values <= 0: min={close_min}")
         if close_max > 10_000_000:  # Sanity check for extreme values
@@ -167,20 +243,32 @@ def validate_data_quality(df: pd.DataFrame) -> None:
         logger.info(f"✓ Close price range: {close_min:.2f} to {close_max:.2f}")
     
     if "Volume" in df.columns:
-        volume_negative = (df["Volume"] < 0).sum()
+        volume_stats = _column_min_max(path, "Volume") if path is not None else None
+        if volume_stats is not None and volume_stats[0] >= 0:
+            volume_negative = 0
+        else:
+            volume_negative = (df["Volume"] < 0).sum()
         if volume_negative > 0:
             raise ValidationError(f"Volume has {volume_negative} negative values")
         logger.info(f"✓ Volume values are non-negative")
 
 
 def validate_no_duplicates(df: pd.DataFrame) -> None:
-    """Validate there are no duplicate Date+Ticker combinations."""
+    """Validate there are no duplicate Date+Ticker combinations.
+    
+    Args:
+        df: Universe feature frame
+    """
     if "Date" not in df.columns or "Ticker" not in df.columns:
         logger.warning("⚠ Cannot check duplicates: Date or Ticker column missing")
         return
     
-    duplicates = df.duplicated(subset=["Date", "Ticker"], keep=False)
-    dup_count = duplicates.sum()
+    keys = pa.Table.from_pandas(df[["Date", "Ticker"]], preserve_index=False)
+    
+    # Hash aggregate on the key columns; only groups seen more than once matter
+    counts = keys.group_by(["Date", "Ticker"]).aggregate([([], "count_all")])["count_all"]
+    dup_groups = pc.filter(counts, pc.greater(counts, 1))
+    dup_count = pc.sum(dup_groups).as_py() or 0
     if dup_count > 0:
         raise ValidationError(
             f"Found {dup_count} duplicate Date+Ticker combinations"
@@ -189,18 +277,29 @@ def validate_no_duplicates(df: pd.DataFrame) -> None:
 
 
 def validate_date_coverage(df: pd.DataFrame, meta: dict[str, Any]) -> None:
-    """Validate date range coverage."""
+    """Validate date range coverage.
+    
+    Args:
+        df: Universe feature frame
+        meta: Universe metadata
+    """
     if "Date" not in df.columns:
         logger.warning("⚠ Cannot check date coverage: Date column missing")
         return
     
-    dates = pd.to_datetime(df["Date"]).dropna()
-    if len(dates) == 0:
+    dates = pa.array(df["Date"], from_pandas=True)
+    if not pa.types.is_temporal(dates.type):
+        # Non-temporal storage (e.g. strings): parse once, then stay in Arrow
+        dates = pa.array(pd.to_datetime(df["Date"]), from_pandas=True)
+    
+    if len(dates) - dates.null_count == 0:
         raise ValidationError("No valid dates in data")
     
-    min_date = dates.min()
-    max_date = dates.max()
-    unique_dates = dates.nunique()
+    # Single-pass Arrow kernels instead of separate pandas min/max/nunique scans
+    extremes = pc.min_max(dates)
+    min_date = pd.Timestamp(extremes["min"].as_py())
+    max_date = pd.Timestamp(extremes["max"].as_py())
+    unique_dates = pc.count_distinct(dates).as_py()
     
     logger.info(
         f"✓ Date coverage: {min_date.strftime('%Y-%m-%d')} to {max_date.strftime('%Y-%m-%d')} "
@@ -244,42 +343,16 @@ def validate_krx_master(path: Path) -> None:
     logger.info(f"✓ KRX stock master structure valid: {len(df)} stocks")
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Validate generated data quality before release"
-    )
-    parser.add_argument(
-        "--cache-dir",
-        type=str,
-        default="cache",
-        help="Directory containing generated cache files (default: cache)",
-    )
-    parser.add_argument(
-        "--require-industry",
-        action="store_true",
-        help="Require industry data files to exist (fail if missing)",
-    )
-    parser.add_argument(
-        "--skip-krx-master",
-        action="store_true",
-        help="Skip validation of KRX stock master file",
-    )
-    
-    args = parser.parse_args()
-    cache_dir = Path(args.cache_dir)
-    
-    if not cache_dir.exists():
-        logger.error(f"Cache directory does not exist: {cache_dir}")
-        sys.exit(1)
-    
-    validation_errors = []
-    
-    logger.info("="*60)
-    logger.info("Starting data validation for release...")
-    logger.info("="*60)
+def validate_universe_files(cache_dir: Path) -> tuple[list[str], dict[str, Any] | None]:
+    """Run all universe feature frame checks.
     
+    Returns:
+        (errors, meta) where meta is the universe metadata if the parquet
+        file could be read, otherwise None.
+    """
+    errors: list[str] = []
+    meta = None
     try:
-        # 1. Validate universe feature frame
         logger.info("\n[1/5] Validating universe feature frame...")
         universe_parquet = cache_dir / "korea_universe_feature_frame.parquet"
         universe_meta = cache_dir / "korea_universe_feature_frame.meta.json"
@@ -288,43 +361,52 @@ def main():
         MIN_FILE_SIZE_MB = 300.0
         validate_file_exists(universe_parquet, "Universe feature frame", min_size_mb=MIN_FILE_SIZE_MB)
         
-        meta = validate_metadata_status(universe_meta)
+        universe_meta_dict = validate_metadata_status(universe_meta)
         df = validate_parquet_readable(universe_parquet, "Universe feature frame")
+        meta = universe_meta_dict
         validate_universe_data_structure(df)
         validate_data_completeness(df, meta)
-        validate_data_quality(df)
+        validate_data_quality(df, universe_parquet)
         validate_no_duplicates(df)
         validate_date_coverage(df, meta)
         
         logger.info("✓ Universe feature frame validation passed")
         
     except ValidationError as e:
-        validation_errors.append(f"Universe validation failed: {e}")
+        errors.append(f"Universe validation failed: {e}")
         logger.error(f"✗ Universe validation failed: {e}")
-    
+    return errors, meta
+
+
+def validate_industry_files(cache_dir: Path, require_industry: bool = False) -> list[str]:
+    """Run industry feature frame checks (optional unless required)."""
+    errors: list[str] = []
     try:
-        # 2. Validate industry feature frame (optional)
         logger.info("\n[2/5] Validating industry feature frame...")
         industry_parquet = cache_dir / "korea_industry_feature_frame.parquet"
         industry_meta = cache_dir / "korea_industry_feature_frame.meta.json"
         
         if industry_parquet.exists():
-            industry_meta_dict = validate_metadata_status(industry_meta)
+            validate_metadata_status(industry_meta)
             industry_df = validate_parquet_readable(industry_parquet, "Industry feature frame")
             validate_industry_data(industry_df)
             logger.info("✓ Industry feature frame validation passed")
-        elif args.require_industry:
+        elif require_industry:
             raise ValidationError("Industry data required but not found")
         else:
             logger.info("⊘ Industry data not present (optional)")
             
     except ValidationError as e:
-        validation_errors.append(f"Industry validation failed: {e}")
+        errors.append(f"Industry validation failed: {e}")
         logger.error(f"✗ Industry validation failed: {e}")
-    
+    return errors
+
+
+def validate_krx_master_files(cache_dir: Path, skip: bool = False) -> list[str]:
+    """Run KRX stock master checks unless skipped."""
+    errors: list[str] = []
     try:
-        # 3. Validate KRX stock master
-        if not args.skip_krx_master:
+        if not skip:
             logger.info("\n[3/5] Validating KRX stock master...")
             krx_master = cache_dir / "krx_stock_master.parquet"
             validate_krx_master(krx_master)
@@ -333,16 +415,109 @@ def main():
             logger.info("\n[3/5] Skipping KRX stock master validation")
             
     except ValidationError as e:
-        validation_errors.append(f"KRX master validation failed: {e}")
+        errors.append(f"KRX master validation failed: {e}")
         logger.error(f"✗ KRX master validation failed: {e}")
+    return errors
+
+
+class _ThreadLogBuffer(logging.Filter):
+    """Hold back log records emitted on validator worker threads.
+    
+    Validators run concurrently, so their step-by-step output would otherwise
+    interleave on stderr. Each submitted job collects its own records, which
+    are replayed in submission order once the job's result is collected.
+    """
+    
+    def __init__(self) -> None:
+        super().__init__()
+        self._buffers: dict[int, list[logging.LogRecord]] = {}
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        buffer = self._buffers.get(record.thread)
+        if buffer is None:
+            return True
+        buffer.append(record)
+        return False
+    
+    def _run(self, records: list[logging.LogRecord], fn, *args):
+        ident = threading.get_ident()
+        self._buffers[ident] = records
+        try:
+            return fn(*args)
+        finally:
+            del self._buffers[ident]
+    
+    def submit(self, executor: ThreadPoolExecutor, fn, *args) -> tuple[Future, list[logging.LogRecord]]:
+        records: list[logging.LogRecord] = []
+        return executor.submit(self._run, records, fn, *args), records
+    
+    def result(self, job: tuple[Future, list[logging.LogRecord]]):
+        future, records = job
+        try:
+            return future.result()
+        finally:
+            for record in records:
+                logger.handle(record)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Validate generated data quality before release"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default="cache",
+        help="Directory containing generated cache files (default: cache)",
+    )
+    parser.add_argument(
+        "--require-industry",
+        action="store_true",
+        help="Require industry data files to exist (fail if missing)",
+    )
+    parser.add_argument(
+        "--skip-krx-master",
+        action="store_true",
+        help="Skip validation of KRX stock master file",
+    )
+    
+    args = parser.parse_args()
+    cache_dir = Path(args.cache_dir)
+    
+    if not cache_dir.exists():
+        logger.error(f"Cache directory does not exist: {cache_dir}")
+        sys.exit(1)
+    
+    validation_errors = []
+    
+    logger.info("="*60)
+    logger.info("Starting data validation for release...")
+    logger.info("="*60)
+    
+    # 1-3. Per-file validations are independent and I/O-bound; run them concurrently
+    # and print each one's log output as a block, in step order
+    log_buffer = _ThreadLogBuffer()
+    logger.addFilter(log_buffer)
+    try:
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            universe_job = log_buffer.submit(executor, validate_universe_files, cache_dir)
+            industry_job = log_buffer.submit(executor, validate_industry_files, cache_dir, args.require_industry)
+            krx_job = log_buffer.submit(executor, validate_krx_master_files, cache_dir, args.skip_krx_master)
+            
+            universe_errors, meta = log_buffer.result(universe_job)
+            validation_errors.extend(universe_errors)
+            validation_errors.extend(log_buffer.result(industry_job))
+            validation_errors.extend(log_buffer.result(krx_job))
+    finally:
+        logger.removeFilter(log_buffer)
     
     # 4. Cross-validation checks
     logger.info("\n[4/5] Cross-validation checks...")
     try:
         # Check if universe metadata matches actual file
-        if 'meta' in locals() and 'df' in locals():
+        if meta is not None:
             meta_file_path = meta.get("data_file", {}).get("path")
-            expected_path = str(universe_parquet)
+            expected_path = str(cache_dir / "korea_universe_feature_frame.parquet")
             if meta_file_path and meta_file_path != expected_path:
                 logger.warning(
                     f"⚠ Metadata path mismatch: {meta_file_path} vs {expected_path}"
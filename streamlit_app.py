@@ -1,13 +1,28 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+import hashlib
 import io
 import os
-import json
+import re
+import orjson
+import tempfile
 import altair as alt
 import datetime as dt
 import duckdb
+import threading
+import time
 from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
 
 st.set_page_config(
     page_title="Korea Stock Feature Cache Inspector",
@@ -22,32 +37,292 @@ default_repo = "capybara-dance/capybara_fetcher"
 repo_name = default_repo
 github_token = ""
 
-@st.cache_data(ttl=60)
-def get_releases(repo, token=None):
-    if not repo:
-        return []
-        
+# (connect, read) timeout in seconds for every GitHub request
+HTTP_TIMEOUT = (5, 30)
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """
+    GitHub API / release asset 다운로드에 공용으로 쓰는 keep-alive 세션.
+    Streamlit은 rerun마다 스크립트를 다시 실행하므로 cache_resource로 프로세스 단위 1개를 유지합니다.
+    """
+    session = requests.Session()
+    # 일시적인 게이트웨이 오류(502/503/504)와 연결 실패는 짧은 backoff로 재시도
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504), raise_on_status=False)
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, pool_block=False, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Accept-Encoding": "gzip", "User-Agent": "capybara-fetcher-inspector"})
+    return session
+
+@st.cache_resource
+def _etag_store() -> dict[tuple[str, str | None], tuple[str, object]]:
+    """
+    (url, token) -> (ETag, 캐시 값). 캐시 값은 파싱된 json 본문이며, releases는 (본문, 다음 페이지 존재 여부)입니다.
+    get_releases / load_json_from_url 캐시가 만료돼도 If-None-Match로 재검증해서 304면 본문 없이 재사용합니다.
+    """
+    return {}
+
+# releases 목록의 신선도 기준 (초). 지나면 캐시 값을 바로 반환하고 백그라운드에서 갱신합니다.
+RELEASES_TTL_SECONDS = 60
+# releases API 한 페이지 크기 (이전 릴리즈는 "Show older releases"로 한 페이지씩 추가 조회)
+RELEASES_PER_PAGE = 20
+
+@st.cache_resource
+def _releases_cache() -> dict[tuple[str, str | None, int], tuple[float, list, bool]]:
+    """(repo, token, page) -> (가져온 시각(monotonic), releases json, 다음 페이지 존재 여부)"""
+    return {}
+
+@st.cache_resource
+def _releases_refreshing() -> tuple[threading.Lock, set]:
+    """백그라운드 갱신이 진행 중인 (repo, token, page) 집합과 그 lock (같은 키 중복 갱신 방지)"""
+    return threading.Lock(), set()
+
+def _fetch_releases(repo: str, token=None, page: int = 1) -> tuple[list | None, bool, list[tuple[str, str]]]:
+    """
+    GitHub releases 목록의 한 페이지를 요청합니다. st.* 를 직접 호출하지 않으므로 백그라운드 스레드에서도 사용 가능합니다.
+    Returns: (releases | 실패 시 None, 다음 페이지 존재 여부, [(level, message)])
+    """
     headers = {}
     if token:
         headers["Authorization"] = f"token {token}"
-    
-    url = f"https://api.github.com/repos/{repo}/releases"
+
+    url = f"https://api.github.com/repos/{repo}/releases?per_page={RELEASES_PER_PAGE}&page={page}"
+    etag_store = _etag_store()
+    cached = etag_store.get((url, token))
+    if cached:
+        headers["If-None-Match"] = cached[0]
+
+    messages: list[tuple[str, str]] = []
     try:
-        response = requests.get(url, headers=headers)
+        response = get_http_session().get(url, headers=headers, timeout=HTTP_TIMEOUT)
+        remaining = response.headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit() and int(remaining) < 10:
+            messages.append(("warning", f"GitHub API rate limit almost exhausted ({remaining} requests left)."))
+        if response.status_code == 304 and cached:
+            # 304 응답은 Link 헤더를 보장하지 않으므로 본문과 함께 저장해 둔 다음 페이지 여부를 재사용
+            releases, has_next = cached[1]
+            return releases, has_next, messages
         if response.status_code == 200:
-            return response.json()
+            releases = response.json()
+            has_next = "next" in response.links
+            etag = response.headers.get("ETag")
+            if etag:
+                etag_store[(url, token)] = (etag, (releases, has_next))
+            return releases, has_next, messages
         elif response.status_code == 404:
-            st.error(f"Repository not found: {repo}")
-            return []
+            messages.append(("error", f"Repository not found: {repo}"))
         else:
-            st.error(f"Failed to fetch releases: {response.status_code} {response.reason}")
-            return []
+            messages.append(("error", f"Failed to fetch releases: {response.status_code} {response.reason}"))
     except Exception as e:
-        st.error(f"Connection error: {e}")
-        return []
+        messages.append(("error", f"Connection error: {e}"))
+    return None, False, messages
+
+def _refresh_releases_in_background(repo: str, token=None, page: int = 1) -> None:
+    lock, refreshing = _releases_refreshing()
+    key = (repo, token, page)
+    with lock:
+        if key in refreshing:
+            return
+        refreshing.add(key)
 
-@st.cache_data(ttl=300)
-def load_parquet_from_url(url, token=None):
+    def refresh():
+        try:
+            releases, has_next, _ = _fetch_releases(repo, token, page)
+            if releases is not None:
+                _releases_cache()[key] = (time.monotonic(), releases, has_next)
+        finally:
+            with lock:
+                refreshing.discard(key)
+
+    threading.Thread(target=refresh, name="releases-refresh", daemon=True).start()
+
+def get_releases(repo, token=None, page: int = 1) -> tuple[list, bool]:
+    """
+    releases 목록의 한 페이지와 다음 페이지 존재 여부를 반환합니다.
+    stale-while-revalidate: TTL이 지난 목록은 그대로 반환하고 갱신은 백그라운드 스레드에서 수행합니다.
+    처음 조회할 때만 요청을 기다립니다.
+    """
+    if not repo:
+        return [], False
+
+    key = (repo, token, page)
+    entry = _releases_cache().get(key)
+    if entry is not None:
+        fetched_at, releases, has_next = entry
+        if time.monotonic() - fetched_at > RELEASES_TTL_SECONDS:
+            _refresh_releases_in_background(repo, token, page)
+        return releases, has_next
+
+    releases, has_next, messages = _fetch_releases(repo, token, page)
+    for level, message in messages:
+        getattr(st, level)(message)
+    if releases is None:
+        return [], False
+    _releases_cache()[key] = (time.monotonic(), releases, has_next)
+    return releases, has_next
+
+def _release_index(releases: list[dict]) -> tuple[tuple[str, ...], dict[str, int]]:
+    """
+    릴리즈 selectbox용 (label 목록, label -> releases 인덱스).
+    release dict 자체를 값으로 담은 dict를 rerun마다 새로 만들지 않도록 label과 위치만 보관합니다.
+    """
+    labels = tuple(f"{r['name']} ({r['tag_name']})" for r in releases)
+    return labels, {label: i for i, label in enumerate(labels)}
+
+# Tail bytes fetched by the first ranged request (parquet footer + metadata)
+_FOOTER_PREFETCH_BYTES = 64 * 1024
+
+class _HttpRangeFile(io.RawIOBase):
+    """
+    HTTP Range 요청으로 seek/read를 구현한 읽기 전용 파일 객체.
+    pyarrow가 footer와 필요한 column chunk 구간만 요청하도록 해서
+    전체 asset을 메모리에 올리지 않습니다.
+    """
+
+    def __init__(self, url: str, headers: dict[str, str], size: int, tail: bytes):
+        self._url = url
+        self._headers = headers
+        self._size = size
+        self._tail = tail
+        self._tail_start = size - len(tail)
+        self._pos = 0
+
+    @classmethod
+    def from_tail_response(cls, response: requests.Response, headers: dict[str, str]) -> "_HttpRangeFile":
+        """`Range: bytes=-N` 요청의 206 응답으로부터 파일 객체를 만듭니다."""
+        # Content-Range: bytes <start>-<end>/<total>
+        size = int(response.headers["Content-Range"].rsplit("/", 1)[1])
+        # Redirect된 서명 URL(S3 등)에는 Authorization 헤더를 보내지 않습니다.
+        if response.history:
+            headers = {k: v for k, v in headers.items() if k.lower() != "authorization"}
+        return cls(response.url, headers, size, response.content)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            self._pos = offset
+        elif whence == io.SEEK_CUR:
+            self._pos += offset
+        elif whence == io.SEEK_END:
+            self._pos = self._size + offset
+        return self._pos
+
+    def readinto(self, b) -> int:
+        n = min(len(b), self._size - self._pos)
+        if n <= 0:
+            return 0
+        start, end = self._pos, self._pos + n
+        if start >= self._tail_start:
+            data = self._tail[start - self._tail_start:end - self._tail_start]
+        else:
+            response = get_http_session().get(
+                self._url,
+                headers={**self._headers, "Range": f"bytes={start}-{end - 1}"},
+                timeout=HTTP_TIMEOUT,
+            )
+            response.raise_for_status()
+            data = response.content[:n]
+        b[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+# Decoded release assets are kept here as uncompressed Arrow IPC (Feather) files
+_LOCAL_CACHE_DIR = Path(os.environ.get("CAPYBARA_CACHE_DIR", Path(tempfile.gettempdir()) / "capybara_fetcher_cache"))
+# Oldest-used files are evicted once the directory grows past this size
+_LOCAL_CACHE_MAX_BYTES = int(os.environ.get("CAPYBARA_CACHE_MAX_MB", "2048")) * 1024 * 1024
+# Temp files older than this were left by a crashed or killed writer
+_LOCAL_CACHE_STALE_TMP_SEC = 10 * 60
+
+def _local_cache_path(url: str, etag: str | None, columns: tuple[str, ...] | None) -> Path | None:
+    """asset URL + ETag(+ projection) 기준의 로컬 캐시 경로. ETag가 없으면 캐시하지 않습니다."""
+    if not etag:
+        return None
+    key = hashlib.sha256(f"{url}|{etag}|{columns}".encode("utf-8")).hexdigest()
+    return _LOCAL_CACHE_DIR / f"{key}.arrow"
+
+def _write_local_cache(table: pa.Table, path: Path) -> None:
+    # Uncompressed so later reads can memory-map the buffers without copying
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 같은 프로세스의 여러 세션 스레드가 동시에 쓰더라도 임시 파일이 겹치지 않도록 mkstemp 사용
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.stem}.", suffix=".tmp")
+        os.close(fd)
+        try:
+            feather.write_feather(table, tmp_name, compression="uncompressed")
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        _evict_local_cache()
+    except OSError:
+        pass  # best-effort cache
+
+def _evict_local_cache() -> None:
+    """
+    로컬 캐시가 _LOCAL_CACHE_MAX_BYTES를 넘으면 가장 오래 사용하지 않은(mtime) 파일부터 지웁니다.
+    중단된 쓰기가 남긴 오래된 *.tmp 파일은 지우고, 쓰는 중인 *.tmp는 용량에만 포함합니다.
+    """
+    total = 0
+    now = time.time()
+    for p in _LOCAL_CACHE_DIR.glob("*.tmp"):
+        try:
+            stat = p.stat()
+        except OSError:
+            continue
+        if now - stat.st_mtime > _LOCAL_CACHE_STALE_TMP_SEC:
+            p.unlink(missing_ok=True)
+        else:
+            total += stat.st_size
+    entries = []
+    for p in _LOCAL_CACHE_DIR.glob("*.arrow"):
+        try:
+            stat = p.stat()
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, p))
+    total += sum(size for _, size, _ in entries)
+    for _, size, p in sorted(entries):
+        if total <= _LOCAL_CACHE_MAX_BYTES:
+            break
+        # 다른 세션이 memory-map 중이어도 POSIX에서는 unlink 후에도 매핑은 유효합니다.
+        p.unlink(missing_ok=True)
+        total -= size
+
+def _table_to_pandas(table: pa.Table) -> pd.DataFrame:
+    """
+    Arrow -> pandas 변환 시 컬럼별 블록을 유지하고(split_blocks) 변환이 끝난 Arrow 버퍼를 바로 해제해
+    (self_destruct) 변환 중 메모리가 두 배로 뛰지 않도록 합니다. 호출 후 table은 사용하면 안 됩니다.
+    """
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+def _dictionary_encode(table: pa.Table, columns: tuple[str, ...]) -> pa.Table:
+    """지정한 (존재하는) 문자열 컬럼을 Arrow dictionary로 인코딩합니다. pandas에서는 category dtype이 됩니다."""
+    for name in columns:
+        i = table.schema.get_field_index(name)
+        if i < 0 or not pa.types.is_string(table.schema.field(i).type):
+            continue
+        table = table.set_column(i, name, pc.dictionary_encode(table.column(i)))
+    return table
+
+# KRX stock master에서 반복되는 값이 많은 컬럼 (category dtype으로 로드)
+KRX_MASTER_CATEGORY_COLUMNS = ("Market", "IndustryLarge", "IndustryMid", "IndustrySmall")
+
+@st.cache_data(ttl=300, max_entries=16)
+def load_parquet_table_from_url(url, token=None, columns: tuple[str, ...] | None = None) -> pa.Table | None:
+    """
+    parquet asset을 다운로드해 Arrow Table로 반환합니다.
+    columns를 지정하면 해당 컬럼의 column chunk만 디코딩합니다 (pyarrow projection).
+    st.cache_data에는 pandas DataFrame 대신 컬럼 버퍼 단위로 직렬화되는 Table을 보관합니다.
+    """
     headers = {}
     # Private asset 다운로드 시에는 token 헤더와 Accept 헤더가 필요할 수 있음
     # 하지만 browser_download_url은 보통 Public이면 바로 접근 가능하고,
@@ -60,19 +335,65 @@ def load_parquet_from_url(url, token=None):
         headers["Authorization"] = f"token {token}"
     
     try:
-        response = requests.get(url, headers=headers, stream=True)
+        # 먼저 파일 끝(footer)만 Range로 요청하고, 이후 필요한 column chunk만 추가로 받습니다.
+        response = get_http_session().get(
+            url,
+            headers={**headers, "Range": f"bytes=-{_FOOTER_PREFETCH_BYTES}"},
+            stream=True,
+            timeout=HTTP_TIMEOUT,
+        )
         response.raise_for_status()
-        return pd.read_parquet(io.BytesIO(response.content))
+
+        # 같은 asset 버전(ETag)은 로컬 Arrow(Feather) 파일을 memory-map 해서 재사용
+        cache_path = _local_cache_path(url, response.headers.get("ETag"), columns)
+        if cache_path is not None and cache_path.exists():
+            response.close()
+            # mtime을 마지막 사용 시각으로 갱신 (LRU eviction 기준)
+            try:
+                os.utime(cache_path)
+            except OSError:
+                pass
+            return feather.read_table(str(cache_path), memory_map=True)
+
+        if response.status_code == 206:
+            source = _HttpRangeFile.from_tail_response(response, headers)
+        else:
+            # Range 미지원 서버: 전체 본문이 왔으므로 그대로 사용
+            source = pa.BufferReader(response.content)
+        pf = pq.ParquetFile(source, pre_buffer=True)
+        table = pf.read(columns=list(columns) if columns else None)
+        if cache_path is not None:
+            _write_local_cache(table, cache_path)
+        return table
     except Exception as e:
         st.error(f"Error loading parquet: {e}")
         return None
 
+def load_parquet_from_url(
+    url,
+    token=None,
+    columns: tuple[str, ...] | None = None,
+    category_columns: tuple[str, ...] = (),
+):
+    """
+    parquet asset을 DataFrame으로 반환합니다 (캐시된 Arrow Table -> pandas 변환).
+    category_columns의 문자열 컬럼은 category dtype으로 반환합니다.
+    """
+    table = load_parquet_table_from_url(url, token, columns)
+    if table is None:
+        return None
+    return _table_to_pandas(_dictionary_encode(table, category_columns))
+
 @st.cache_resource
 def get_duckdb_conn():
     con = duckdb.connect(database=":memory:")
     # HTTP range reads for large parquet
     con.execute("INSTALL httpfs;")
     con.execute("LOAD httpfs;")
+    # 같은 asset URL에 대한 HEAD(크기/ETag)와 parquet footer를 connection 단위로 캐시해서
+    # query_* 호출마다 footer를 다시 받지 않도록 합니다. (Clear cache 시 connection을 새로 만듦)
+    con.execute("SET enable_http_metadata_cache = true;")
+    con.execute("SET parquet_metadata_cache = true;")
     return con
 
 @st.cache_data(ttl=300)
@@ -93,7 +414,11 @@ def query_feature_parquet(
           AND "Date" <= ?
         ORDER BY "Date"
     """
-    return con.execute(sql, [parquet_url, ticker, str(start_date), str(end_date)]).df()
+    df = con.execute(sql, [parquet_url, ticker, str(start_date), str(end_date)]).df()
+    # Date 변환은 캐시에 넣기 전에 한 번만 (이후 rerun/차트에서는 변환하지 않음)
+    if "Date" in df.columns:
+        df["Date"] = _ensure_datetime(df["Date"])
+    return df
 
 @st.cache_data(ttl=300)
 def query_feature_date_bounds(parquet_url: str, ticker: str):
@@ -116,41 +441,38 @@ def get_parquet_columns(parquet_url: str) -> list[str]:
     return list(df0.columns)
 
 @st.cache_data(ttl=300)
-def query_industry_parquet(
+def query_industries_parquet(
     parquet_url: str,
     level: str,
-    industry_large: str,
-    industry_mid: str,
-    industry_small: str,
+    industries: tuple[tuple[str, str, str], ...],
     start_date: dt.date,
     end_date: dt.date,
     columns: tuple[str, ...],
 ) -> pd.DataFrame:
+    """
+    여러 업종 (IndustryLarge, IndustryMid, IndustrySmall)의 시계열을 한 번의 scan으로 조회합니다.
+    업종별로 나누어 쓸 수 있도록 세 업종 컬럼을 항상 함께 반환합니다.
+    """
+    key_cols = ("IndustryLarge", "IndustryMid", "IndustrySmall")
+    if not industries:
+        return pd.DataFrame(columns=[*key_cols, *columns])
     con = get_duckdb_conn()
-    cols_sql = ", ".join([f'"{c}"' for c in columns])
+    cols_sql = ", ".join([f'"{c}"' for c in (*key_cols, *[c for c in columns if c not in key_cols])])
+    match_sql = " OR ".join(['("IndustryLarge" = ? AND "IndustryMid" = ? AND "IndustrySmall" = ?)'] * len(industries))
     sql = f"""
         SELECT {cols_sql}
         FROM read_parquet(?)
         WHERE "Level" = ?
-          AND "IndustryLarge" = ?
-          AND "IndustryMid" = ?
-          AND "IndustrySmall" = ?
+          AND ({match_sql})
           AND "Date" >= ?
           AND "Date" <= ?
         ORDER BY "Date"
     """
-    return con.execute(
-        sql,
-        [
-            parquet_url,
-            level,
-            industry_large,
-            industry_mid,
-            industry_small,
-            str(start_date),
-            str(end_date),
-        ],
-    ).df()
+    params = [parquet_url, level, *[v for industry in industries for v in industry], str(start_date), str(end_date)]
+    df = con.execute(sql, params).df()
+    if "Date" in df.columns:
+        df["Date"] = _ensure_datetime(df["Date"])
+    return df
 
 @st.cache_data(ttl=300)
 def query_industry_date_bounds(
@@ -237,27 +559,23 @@ def query_industry_rank_by_rs(parquet_url: str, level: str, asof_date: dt.date)
     """
     return con.execute(sql, [parquet_url, level, parquet_url, level, str(asof_date)]).df()
 
-def _normalize_na_to_empty(v: object) -> str:
-    """Normalize NA/None/nan values to empty string for display."""
-    if v is None or pd.isna(v):
-        return ""
-    s = str(v).strip()
+def _normalize_na_to_unknown(values: pd.Series) -> pd.Series:
+    """Normalize NA/None/nan (and their string forms / blanks) to "Unknown" for display."""
+    s = values.astype("string").str.strip()
     # Handle string representations of NA
-    if s.lower() in {"nan", "none", "<na>", "na"}:
-        return ""
-    return s
-
-def _industry_label(level: str, large: str, mid: str, small: str) -> str:
-    # Normalize NA values before creating label
-    large = _normalize_na_to_empty(large) or "Unknown"
-    mid = _normalize_na_to_empty(mid) or "Unknown"
-    small = _normalize_na_to_empty(small) or "Unknown"
-    
+    na = s.isna() | s.str.lower().isin(["nan", "none", "<na>", "na", ""]).fillna(True)
+    return s.mask(na, "Unknown").astype(str)
+
+def _industry_labels(level: str, df: pd.DataFrame) -> pd.Series:
+    """IndustryLarge/Mid/Small 컬럼으로 level별 업종 label을 한 번에(vectorized) 만듭니다."""
+    large = _normalize_na_to_unknown(df["IndustryLarge"])
     if level == "L":
-        return f"{large}"
+        return large
+    mid = _normalize_na_to_unknown(df["IndustryMid"])
     if level == "LM":
-        return f"{large} / {mid}"
-    return f"{large} / {mid} / {small}"
+        return large + " / " + mid
+    small = _normalize_na_to_unknown(df["IndustrySmall"])
+    return large + " / " + mid + " / " + small
 
 @st.cache_data(ttl=300)
 def query_tickers_rs_by_ticker_list(
@@ -302,23 +620,92 @@ def load_json_from_url(url, token=None):
     if token:
         headers["Authorization"] = f"token {token}"
 
+    etag_store = _etag_store()
+    cached = etag_store.get((url, token))
+    if cached:
+        headers["If-None-Match"] = cached[0]
+
     try:
-        response = requests.get(url, headers=headers, stream=True)
+        response = get_http_session().get(url, headers=headers, stream=True, timeout=HTTP_TIMEOUT)
+        if response.status_code == 304 and cached:
+            return cached[1]
         response.raise_for_status()
-        return json.loads(response.content.decode("utf-8"))
+        # orjson은 bytes를 바로 파싱하므로 decode로 인한 str 복사가 생기지 않습니다.
+        obj = orjson.loads(response.content)
+        etag = response.headers.get("ETag")
+        if etag:
+            etag_store[(url, token)] = (etag, obj)
+        return obj
     except Exception as e:
         st.error(f"Error loading metadata json: {e}")
         return None
 
+# st.dataframe 미리보기 한 페이지당 행 수
+PREVIEW_PAGE_ROWS = 50
+
+def _downcast_for_display(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    st.dataframe 미리보기 전용: 숫자 컬럼을 작은 dtype으로 줄여 브라우저로 보내는 Arrow payload를 줄입니다.
+    (float64 -> float32, int64 -> 값 범위에 맞는 가장 작은 정수형) 원본 df는 건드리지 않습니다.
+    """
+    out = df.copy()
+    for c in out.select_dtypes(include="float64").columns:
+        out[c] = out[c].astype("float32")
+    for c in out.select_dtypes(include="int64").columns:
+        out[c] = pd.to_numeric(out[c], downcast="integer")
+    return out
+
+# Altair 툴팁 숫자 형식 (float32 변환으로 생기는 끝자리 잡음을 숨김)
+TOOLTIP_NUMBER_FORMAT = ",.4~f"
+
+def _downcast_for_chart(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    st.altair_chart는 차트 데이터를 Arrow로 브라우저에 보내므로 float64 컬럼을 float32로 줄여 payload를 절반으로 만듭니다.
+    """
+    float_cols = df.select_dtypes(include="float64").columns
+    if len(float_cols) == 0:
+        return df
+    return df.astype({c: "float32" for c in float_cols})
+
 def _ensure_datetime(series: pd.Series) -> pd.Series:
     # Robust conversion for parquet-loaded types (datetime64, date, int timestamp, etc.)
+    # DuckDB/parquet 결과는 대부분 이미 datetime64이므로 그 경우는 파싱 없이 그대로 반환합니다.
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in "iu":
+        # epoch(ns) 정수: pd.to_datetime과 같은 해석을 astype으로
+        # (nullable Int64 등 NA를 가질 수 있는 확장 dtype은 아래 pd.to_datetime 경로로)
+        return series.astype("int64").astype("datetime64[ns]")
     return pd.to_datetime(series, errors="coerce")
 
-def _pick_default_date_window(dmin: pd.Timestamp, dmax: pd.Timestamp, days: int = 365) -> tuple[pd.Timestamp, pd.Timestamp]:
-    if pd.isna(dmin) or pd.isna(dmax):
-        return dmin, dmax
-    start = max(dmin, dmax - pd.Timedelta(days=days))
-    return start, dmax
+def _ticker_option_labels(df: pd.DataFrame) -> list[str]:
+    """종목 selectbox 표시 문자열: "<Ticker> - <Name> (<Market>)" (컬럼이 없으면 빈 문자열)"""
+    def col(name: str) -> pd.Series:
+        return df[name].astype(str) if name in df.columns else pd.Series("", index=df.index)
+    return (col("Ticker") + " - " + col("Name") + " (" + col("Market") + ")").tolist()
+
+def _build_ticker_index(master_df: pd.DataFrame, tickers_in_data: list[str]):
+    """
+    KRX master로 종목 선택 UI용 인덱스를 만듭니다.
+    Returns: (선택지 frame [Ticker, ..., _t_lc, _n_lc], 표시 label Series, Ticker -> master row dict)
+    _t_lc/_n_lc는 검색용 소문자 Ticker/Name으로, 키 입력마다 다시 lower()하지 않도록 미리 만들어 둡니다.
+    """
+    codes = master_df["Code"].astype(str)
+    if tickers_in_data:
+        in_data = codes.isin(tickers_in_data)
+        mv = master_df[in_data].assign(Code=codes[in_data])
+    else:
+        mv = master_df.assign(Code=codes)
+    choices = mv.rename(columns={"Code": "Ticker"}).reset_index(drop=True)
+    choices["_t_lc"] = choices["Ticker"].str.lower()
+    choices["_n_lc"] = choices["Name"].fillna("").astype(str).str.lower() if "Name" in choices.columns else ""
+    labels = pd.Series(_ticker_option_labels(choices), index=choices.index)
+    info = master_df.assign(Code=codes).drop_duplicates("Code").set_index("Code").to_dict(orient="index")
+    return choices, labels, info
+
+def _pick_default_date_window(dmin: dt.date, dmax: dt.date, days: int = 365) -> tuple[dt.date, dt.date]:
+    # slider 기본 구간 (최근 days일). rerun마다 불리므로 pandas scalar 변환 없이 dt.date 산술만 사용
+    return max(dmin, dmax - dt.timedelta(days=days)), dmax
 
 def _axis_assignment(df: pd.DataFrame, base_col: str, other_cols: list[str]) -> tuple[list[str], list[str]]:
     """
@@ -326,24 +713,18 @@ def _axis_assignment(df: pd.DataFrame, base_col: str, other_cols: list[str]) ->
     """
     if base_col not in df.columns:
         return [base_col], other_cols
-    base = pd.to_numeric(df[base_col], errors="coerce")
-    base_range = float((base.max() - base.min()) if base.notna().any() else 0.0)
+    # 모든 컬럼의 (max - min)을 한 번에 계산 (전부 NA인 컬럼은 range 0)
+    numeric = df[[base_col, *other_cols]].apply(pd.to_numeric, errors="coerce").astype("float64")
+    ranges = (numeric.max() - numeric.min()).fillna(0.0).to_numpy()
+    base_range = float(ranges[0])
     if base_range <= 0:
         return [base_col] + other_cols, []
 
-    left_cols = [base_col]
-    right_cols: list[str] = []
-    for c in other_cols:
-        s = pd.to_numeric(df[c], errors="coerce")
-        r = float((s.max() - s.min()) if s.notna().any() else 0.0)
-        if r <= 0:
-            left_cols.append(c)
-            continue
-        ratio = r / base_range
-        if ratio >= 10 or ratio <= 0.1:
-            right_cols.append(c)
-        else:
-            left_cols.append(c)
+    other_ranges = ranges[1:]
+    ratios = other_ranges / base_range
+    to_right = (other_ranges > 0) & ((ratios >= 10) | (ratios <= 0.1))
+    left_cols = [base_col] + [c for c, right in zip(other_cols, to_right) if not right]
+    right_cols = [c for c, right in zip(other_cols, to_right) if right]
     return left_cols, right_cols
 
 def _build_newhigh_marker_layer(
@@ -362,12 +743,12 @@ def _build_newhigh_marker_layer(
     if y_col not in df.columns:
         return None
 
-    m = df[df["IsNewHigh1Y"] == True].copy()  # noqa: E712 (pandas nullable boolean)
-    if m.empty:
+    # nullable boolean(NA 포함)도 NumPy bool 배열로 한 번에 변환 (df는 query에서 이미 Date 순으로 정렬됨)
+    idx = np.flatnonzero(df["IsNewHigh1Y"].to_numpy(dtype=bool, na_value=False))
+    if idx.size == 0:
         return None
 
-    m = m[[date_col, y_col]].copy().sort_values(date_col)
-    m["Event"] = title
+    m = df[[date_col, y_col]].take(idx).assign(Event=title)
     return (
         alt.Chart(m)
         .mark_point(shape="triangle-up", filled=True, size=size, color=color)
@@ -377,7 +758,7 @@ def _build_newhigh_marker_layer(
             y=alt.Y(f"{y_col}:Q", axis=None),
             tooltip=[
                 alt.Tooltip(f"{date_col}:T"),
-                alt.Tooltip(f"{y_col}:Q", title=y_col),
+                alt.Tooltip(f"{y_col}:Q", title=y_col, format=TOOLTIP_NUMBER_FORMAT),
                 alt.Tooltip("Event:N"),
             ],
         )
@@ -391,26 +772,19 @@ def _build_dual_axis_chart(
     *,
     marker_layer=None,
 ):
-    base = df[[date_col] + sorted(set(left_cols + right_cols))].copy()
-    base = base.sort_values(date_col)
-
-    def melt(cols: list[str]) -> pd.DataFrame:
-        if not cols:
-            return pd.DataFrame(columns=[date_col, "metric", "value"])
-        return base[[date_col] + cols].melt(id_vars=[date_col], var_name="metric", value_name="value")
-
-    left_long = melt(left_cols)
-    right_long = melt(right_cols)
+    # wide frame 하나를 좌/우 layer가 공유하고, long 변환은 Vega의 fold transform에 맡깁니다.
+    base = df[[date_col] + sorted(set(left_cols + right_cols))].sort_values(date_col)
 
     x = alt.X(f"{date_col}:T", title="Date")
     left = (
-        alt.Chart(left_long)
+        alt.Chart(base)
+        .transform_fold(left_cols, as_=["metric", "value"])
         .mark_line()
         .encode(
             x=x,
             y=alt.Y("value:Q", title="Left axis"),
             color=alt.Color("metric:N", title="Metric"),
-            tooltip=[alt.Tooltip(f"{date_col}:T"), alt.Tooltip("metric:N"), alt.Tooltip("value:Q")],
+            tooltip=[alt.Tooltip(f"{date_col}:T"), alt.Tooltip("metric:N"), alt.Tooltip("value:Q", format=TOOLTIP_NUMBER_FORMAT)],
         )
     )
     if marker_layer is not None:
@@ -422,13 +796,14 @@ def _build_dual_axis_chart(
 
     if right_cols:
         right = (
-            alt.Chart(right_long)
+            alt.Chart(base)
+            .transform_fold(right_cols, as_=["metric", "value"])
             .mark_line(strokeDash=[6, 2])
             .encode(
                 x=x,
                 y=alt.Y("value:Q", axis=alt.Axis(orient="right", title="Right axis")),
                 color=alt.Color("metric:N", legend=None),
-                tooltip=[alt.Tooltip(f"{date_col}:T"), alt.Tooltip("metric:N"), alt.Tooltip("value:Q")],
+                tooltip=[alt.Tooltip(f"{date_col}:T"), alt.Tooltip("metric:N"), alt.Tooltip("value:Q", format=TOOLTIP_NUMBER_FORMAT)],
             )
         )
         return alt.layer(left, right).resolve_scale(y="independent")
@@ -445,66 +820,51 @@ def _build_candlestick_chart(df: pd.DataFrame, date_col: str = "Date", marker_la
     if not needed.issubset(set(df.columns)):
         return None
 
-    base = df[[date_col, "Open", "High", "Low", "Close"]].copy()
-    base = base.sort_values(date_col)
-    base["is_up"] = (pd.to_numeric(base["Close"], errors="coerce") >= pd.to_numeric(base["Open"], errors="coerce"))
+    # 상승/하락(is_up)은 브라우저에서 transform_calculate로 계산해 payload에 bool 컬럼을 싣지 않습니다.
+    base = df[[date_col, "Open", "High", "Low", "Close"]].sort_values(date_col)
 
     x = alt.X(f"{date_col}:T", title="Date")
+    color = alt.condition("datum.is_up", alt.value("#16a34a"), alt.value("#dc2626"))
+    tooltip = [
+        alt.Tooltip(f"{date_col}:T"),
+        alt.Tooltip("Open:Q", format=TOOLTIP_NUMBER_FORMAT),
+        alt.Tooltip("High:Q", format=TOOLTIP_NUMBER_FORMAT),
+        alt.Tooltip("Low:Q", format=TOOLTIP_NUMBER_FORMAT),
+        alt.Tooltip("Close:Q", format=TOOLTIP_NUMBER_FORMAT),
+    ]
 
     wick = (
-        alt.Chart(base)
+        alt.Chart()
         .mark_rule()
-        .encode(
-            x=x,
-            y=alt.Y("Low:Q", title="Price"),
-            y2="High:Q",
-            color=alt.condition("datum.is_up", alt.value("#16a34a"), alt.value("#dc2626")),
-            tooltip=[
-                alt.Tooltip(f"{date_col}:T"),
-                alt.Tooltip("Open:Q"),
-                alt.Tooltip("High:Q"),
-                alt.Tooltip("Low:Q"),
-                alt.Tooltip("Close:Q"),
-            ],
-        )
+        .encode(x=x, y=alt.Y("Low:Q", title="Price"), y2="High:Q", color=color, tooltip=tooltip)
     )
 
     body = (
-        alt.Chart(base)
+        alt.Chart()
         .mark_bar()
-        .encode(
-            x=x,
-            y=alt.Y("Open:Q", title=None),
-            y2="Close:Q",
-            color=alt.condition("datum.is_up", alt.value("#16a34a"), alt.value("#dc2626")),
-            tooltip=[
-                alt.Tooltip(f"{date_col}:T"),
-                alt.Tooltip("Open:Q"),
-                alt.Tooltip("High:Q"),
-                alt.Tooltip("Low:Q"),
-                alt.Tooltip("Close:Q"),
-            ],
-        )
+        .encode(x=x, y=alt.Y("Open:Q", title=None), y2="Close:Q", color=color, tooltip=tooltip)
     )
 
+    # wick/body는 같은 데이터를 공유 (dataset 1개, is_up 계산도 1번)
+    candle = alt.layer(wick, body, data=base).transform_calculate(is_up="datum.Close >= datum.Open")
+
     # Put marker first so axis/title from candle layers remain visible.
-    layers = [marker_layer, wick, body] if marker_layer is not None else [wick, body]
-    return alt.layer(*layers)
+    return alt.layer(marker_layer, candle) if marker_layer is not None else candle
 
 def _build_metric_overlay_lines(df: pd.DataFrame, date_col: str, cols: list[str], axis_orient: str, show_legend: bool):
     if not cols:
         return None
-    base = df[[date_col] + cols].copy().sort_values(date_col)
-    long = base.melt(id_vars=[date_col], var_name="metric", value_name="value")
+    base = df[[date_col] + cols].sort_values(date_col)
     axis = alt.Axis(orient=axis_orient, title=("Right axis" if axis_orient == "right" else "Left axis"))
     return (
-        alt.Chart(long)
+        alt.Chart(base)
+        .transform_fold(cols, as_=["metric", "value"])
         .mark_line()
         .encode(
             x=alt.X(f"{date_col}:T", title="Date"),
             y=alt.Y("value:Q", axis=axis),
             color=alt.Color("metric:N", title="Metric", legend=None if not show_legend else alt.Legend()),
-            tooltip=[alt.Tooltip(f"{date_col}:T"), alt.Tooltip("metric:N"), alt.Tooltip("value:Q")],
+            tooltip=[alt.Tooltip(f"{date_col}:T"), alt.Tooltip("metric:N"), alt.Tooltip("value:Q", format=TOOLTIP_NUMBER_FORMAT)],
         )
     )
 
@@ -549,40 +909,251 @@ def _build_candlestick_with_metrics(df: pd.DataFrame, date_col: str, metrics: li
 
     return alt.layer(left_chart, right_lines).resolve_scale(y="independent")
 
-def find_meta_asset(assets, parquet_asset_name: str):
+
+# Altair의 data transformer / theme 설정은 프로세스 전역이므로 변환 중에는 잠급니다.
+# st.altair_chart(업종 차트 등)와 서로 배제되도록 가능하면 Streamlit이 쓰는 lock을 같이 씁니다.
+try:
+    from streamlit.elements.vega_charts import _altair_globals_lock as _VEGA_LITE_SPEC_LOCK
+except ImportError:
+    _VEGA_LITE_SPEC_LOCK = threading.Lock()
+
+def _to_named_dataset(data, datasets: dict[str, object]) -> dict[str, str]:
+    """
+    Altair data transformer: 차트 데이터를 호출마다 넘겨받은 datasets dict에 이름으로 보관하고 참조만 spec에 남깁니다.
+    같은 DataFrame을 쓰는 layer는 하나의 dataset을 공유합니다.
+    """
+    for name, existing in datasets.items():
+        if existing is data:
+            return {"name": name}
+    name = f"data-{len(datasets)}"
+    datasets[name] = data
+    return {"name": name}
+
+alt.data_transformers.register("capybara_named_datasets", _to_named_dataset)
+
+def _to_vega_lite_spec(chart) -> dict:
+    """
+    Altair chart를 Vega-Lite spec(dict)으로 한 번만 변환합니다.
+    st.altair_chart는 rerun마다 chart.to_dict()(schema 검증 포함)를 다시 실행하므로,
+    캐시되는 차트는 spec으로 보관해 st.vega_lite_chart로 그립니다.
+    차트 데이터는 spec["datasets"]에 DataFrame 그대로 두어 Streamlit이 Arrow로 전송하게 합니다.
+    """
+    datasets: dict[str, object] = {}
+    theme = getattr(alt, "theme", None) or alt.themes
+    with _VEGA_LITE_SPEC_LOCK:
+        # 기본 theme의 width/height 설정은 use_container_width와 맞지 않으므로 끕니다 (st.altair_chart와 동일)
+        with theme.enable("none"), alt.data_transformers.enable("capybara_named_datasets", datasets=datasets):
+            spec = chart.to_dict()
+    spec["datasets"] = datasets
+    return spec
+
+# 이 기간보다 길면 (downsample 옵션 시) 일봉 대신 주간 봉으로 차트를 그립니다.
+DOWNSAMPLE_MIN_DAYS = 365 * 2
+
+def _resample_weekly(df: pd.DataFrame, date_col: str) -> pd.DataFrame:
+    """
+    일봉 frame을 주간(W) 봉으로 묶습니다.
+    OHLC는 first/max/min/last, 거래량/거래대금(Volume/TradingValue)은 주간 합계,
+    IsNewHigh1Y는 주 중 한 번이라도 True면 True, 그 외 숫자 컬럼은 평균.
+    """
+    ohlc = {
+        "Open": "first",
+        "High": "max",
+        "Low": "min",
+        "Close": "last",
+        "Volume": "sum",
+        "TradingValue": "sum",
+        "IsNewHigh1Y": "max",
+    }
+    agg = {}
+    for c in df.columns:
+        if c == date_col:
+            continue
+        if c in ohlc:
+            agg[c] = ohlc[c]
+        elif pd.api.types.is_numeric_dtype(df[c]) and not pd.api.types.is_bool_dtype(df[c]):
+            agg[c] = "mean"
+        else:
+            agg[c] = "last"
+    # 각 주간 봉의 날짜는 resample 라벨(그 주의 일요일) 대신 그 주의 마지막 실제 거래일로 둡니다.
+    # (일요일 라벨은 선택한 기간 끝이나 마지막 데이터 이후의 날짜가 될 수 있음)
+    resampled = df.dropna(subset=[date_col]).set_index(date_col, drop=False).resample("W")
+    weekly = resampled.agg({date_col: "max", **agg})
+    # 데이터가 없는 주(연휴 등)는 제외: sum은 빈 구간에서 0이 되므로 dropna만으로는 걸러지지 않음
+    weekly = weekly[resampled.size() > 0]
+    if agg:
+        weekly = weekly.dropna(how="all", subset=list(agg))
+    return weekly.reset_index(drop=True)
+
+@st.cache_data(ttl=300, max_entries=64, show_spinner=False)
+def build_ticker_line_chart(
+    feature_url: str,
+    ticker: str,
+    start_date: dt.date,
+    end_date: dt.date,
+    metrics: tuple[str, ...],
+    marker_col: str,
+    show_newhigh: bool,
+    downsample: bool = False,
+):
+    """
+    종목 라인 차트(Close + metrics)를 (종목, 기간, 지표) 단위로 캐시합니다.
+    Returns: (데이터 존재 여부, Vega-Lite spec | None)
+    """
+    need_cols = tuple(["Date", "Ticker"] + sorted(set(["Close", *metrics, "IsNewHigh1Y", marker_col])))
+    one = query_feature_parquet(feature_url, ticker, start_date, end_date, need_cols)
+    if one.empty:
+        return False, None
+    if downsample and (end_date - start_date).days > DOWNSAMPLE_MIN_DAYS:
+        one = _resample_weekly(one, "Date")
+    one = _downcast_for_chart(one)
+    newhigh_layer = _build_newhigh_marker_layer(one, "Date", marker_col) if show_newhigh else None
+    left_cols, right_cols = _axis_assignment(one, "Close", list(metrics))
+    chart = _build_dual_axis_chart(one, "Date", ["Close"] + [c for c in left_cols if c != "Close"], right_cols, marker_layer=newhigh_layer)
+    return True, _to_vega_lite_spec(chart)
+
+@st.cache_data(ttl=300, max_entries=64, show_spinner=False)
+def build_ticker_candle_chart(
+    feature_url: str,
+    ticker: str,
+    start_date: dt.date,
+    end_date: dt.date,
+    metrics: tuple[str, ...],
+    marker_col: str,
+    show_newhigh: bool,
+    downsample: bool = False,
+):
+    """
+    종목 캔들 차트(OHLC + overlay metrics)를 (종목, 기간, 지표) 단위로 캐시합니다.
+    Returns: (데이터 존재 여부, Vega-Lite spec | None)
+    """
+    need_cols = tuple(["Date", "Ticker", "Open", "High", "Low", "Close"] + sorted(set([*metrics, "IsNewHigh1Y", marker_col])))
+    one = query_feature_parquet(feature_url, ticker, start_date, end_date, need_cols)
+    if one.empty:
+        return False, None
+    if downsample and (end_date - start_date).days > DOWNSAMPLE_MIN_DAYS:
+        one = _resample_weekly(one, "Date")
+    one = _downcast_for_chart(one)
+    newhigh_layer = _build_newhigh_marker_layer(one, "Date", marker_col) if show_newhigh else None
+    candle = _build_candlestick_with_metrics(one, "Date", list(metrics), marker_layer=newhigh_layer)
+    return True, (_to_vega_lite_spec(candle) if candle is not None else None)
+
+# st.fragment (Streamlit >= 1.37, 1.33~1.36은 experimental_fragment)가 없으면 일반 함수로 실행합니다.
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None) or (lambda fn: fn)
+
+@_fragment
+def _ticker_chart_section(feature_url: str, selected_ticker: str, numeric_candidates: list[str]) -> None:
+    """
+    종목 차트(기간 slider, 옵션, line/candle 탭)를 fragment로 그립니다.
+    slider/checkbox/multiselect 변경 시 릴리즈/asset/종목 선택 등 페이지 전체가 아니라 이 부분만 다시 실행됩니다.
+    """
+    try:
+        min_date, max_date = query_feature_date_bounds(feature_url, selected_ticker)
+    except Exception as e:
+        st.error(f"Failed to query date bounds (likely URL/access issue): {e}")
+        min_date, max_date = None, None
+
+    if min_date is None or max_date is None:
+        st.warning("No data available for selected ticker.")
+    else:
+        min_d = pd.to_datetime(min_date).date()
+        max_d = pd.to_datetime(max_date).date()
+        start_d, end_d = st.slider("Date range", min_value=min_d, max_value=max_d, value=_pick_default_date_window(min_d, max_d))
+
+        show_newhigh = st.checkbox("Show 1Y New High markers", value=False)
+        downsample = st.checkbox(
+            "Smart downsample (weekly bars when range > 2Y)",
+            value=True,
+            help="긴 기간은 주간 봉으로 묶어 차트에 보내는 점 수를 줄입니다.",
+        )
+        # Marker position is fixed to Close (UI removed)
+        marker_pos = "Close"
+
+        tab_line, tab_candle = st.tabs(["Close & Metrics (Line)", "Candlestick (OHLC)"])
+
+        with tab_line:
+            extra = st.multiselect(
+                "Additional numeric metrics (Close is always shown)",
+                options=[c for c in numeric_candidates if c != "Close"],
+                default=[],
+            )
+            metrics = tuple(c for c in extra if c != "Close")
+            has_data, chart = build_ticker_line_chart(
+                feature_url, selected_ticker, start_d, end_d, metrics, marker_pos, show_newhigh, downsample
+            )
+            if not has_data:
+                st.warning("No data in selected date range.")
+            else:
+                st.vega_lite_chart(chart, use_container_width=True)
+
+        with tab_candle:
+            extra = st.multiselect(
+                "Additional numeric metrics to overlay",
+                options=[c for c in numeric_candidates if c not in {"Open", "High", "Low", "Close"}],
+                default=[],
+                key="candle_extra_metrics",
+            )
+            metrics = tuple(c for c in extra if c != "Close")
+            has_data, candle = build_ticker_candle_chart(
+                feature_url, selected_ticker, start_d, end_d, metrics, marker_pos, show_newhigh, downsample
+            )
+            if not has_data:
+                st.warning("No data in selected date range.")
+            elif candle is None:
+                st.info("Could not build candlestick chart for this data.")
+            else:
+                st.vega_lite_chart(candle, use_container_width=True)
+
+# asset 이름 휴리스틱 (rerun마다 .lower() 복사본을 만들지 않도록 미리 컴파일)
+_FEATURE_FRAME_NAME_RE = re.compile(r"(?=.*feature)(?=.*frame)", re.IGNORECASE)
+_INDUSTRY_NAME_RE = re.compile(r"industry", re.IGNORECASE)
+_KRX_STOCK_MASTER_NAME_RE = re.compile(r"krx_stock_master", re.IGNORECASE)
+
+def _index_assets(assets):
+    """
+    릴리즈 asset 목록을 한 번만 순회해 조회용 인덱스를 만듭니다.
+    Returns: (이름 -> asset, parquet asset 목록, meta json asset 목록)
+    """
+    by_name = {}
+    parquets = []
+    metas = []
+    for a in assets:
+        name = a.get("name", "")
+        # 이름이 겹치면 기존 선형 탐색과 동일하게 첫 asset을 사용
+        by_name.setdefault(name, a)
+        if name.endswith(".parquet"):
+            parquets.append(a)
+        elif name.endswith(".meta.json"):
+            metas.append(a)
+    return by_name, parquets, metas
+
+def find_meta_asset(asset_index, parquet_asset_name: str):
     """
     parquet 자산과 짝이 되는 meta json을 찾습니다.
     기본 규칙: <name>.parquet -> <name>.meta.json
     """
-    expected = parquet_asset_name.replace(".parquet", ".meta.json")
-    for a in assets:
-        if a.get("name") == expected:
-            return a
-    return None
+    by_name, _, _ = asset_index
+    return by_name.get(parquet_asset_name.replace(".parquet", ".meta.json"))
 
-def find_asset_by_name(assets, asset_name: str):
-    for a in assets:
-        if a.get("name") == asset_name:
-            return a
-    return None
+def find_asset_by_name(asset_index, asset_name: str):
+    by_name, _, _ = asset_index
+    return by_name.get(asset_name)
 
-def pick_meta_asset(assets):
-    meta_assets = [a for a in assets if a.get("name", "").endswith(".meta.json")]
+def pick_meta_asset(asset_index):
+    by_name, _, meta_assets = asset_index
     if not meta_assets:
         return None
     # Prefer the known default name if present
-    for a in meta_assets:
-        if a.get("name") == "korea_universe_feature_frame.meta.json":
-            return a
+    if "korea_universe_feature_frame.meta.json" in by_name:
+        return by_name["korea_universe_feature_frame.meta.json"]
     # Otherwise prefer assets that look like they belong to the feature frame
     for a in meta_assets:
-        n = a.get("name", "").lower()
-        if "feature" in n and "frame" in n:
+        if _FEATURE_FRAME_NAME_RE.match(a.get("name", "")):
             return a
     return meta_assets[0]
 
-def pick_feature_asset(assets):
-    parquet_assets = [a for a in assets if a.get("name", "").endswith(".parquet")]
+def pick_feature_asset(asset_index):
+    by_name, parquet_assets, _ = asset_index
     feature_assets = [
         a
         for a in parquet_assets
@@ -591,40 +1162,65 @@ def pick_feature_asset(assets):
     if not feature_assets:
         return None
     # Prefer the known default name if present
-    for a in feature_assets:
-        if a.get("name") == "korea_universe_feature_frame.parquet":
-            return a
+    if "korea_universe_feature_frame.parquet" in by_name:
+        return by_name["korea_universe_feature_frame.parquet"]
     # Otherwise prefer assets that look like they belong to the feature frame
     for a in feature_assets:
-        n = a.get("name", "").lower()
-        if "feature" in n and "frame" in n:
+        if _FEATURE_FRAME_NAME_RE.match(a.get("name", "")):
             return a
     return feature_assets[0]
 
-def pick_industry_asset(assets):
-    candidates = [a for a in assets if a.get("name", "").endswith(".parquet")]
-    if not candidates:
-        return None
-    for a in candidates:
-        if a.get("name") == "korea_industry_feature_frame.parquet":
-            return a
+def pick_industry_asset(asset_index):
+    by_name, candidates, _ = asset_index
+    if "korea_industry_feature_frame.parquet" in by_name:
+        return by_name["korea_industry_feature_frame.parquet"]
     for a in candidates:
-        if "industry" in (a.get("name", "").lower()):
+        if _INDUSTRY_NAME_RE.search(a.get("name", "")):
             return a
     return None
 
-def pick_krx_stock_master_asset(assets):
-    candidates = [a for a in assets if a.get("name", "").endswith(".parquet")]
-    if not candidates:
-        return None
-    for a in candidates:
-        if a.get("name") == "krx_stock_master.parquet":
-            return a
+def pick_krx_stock_master_asset(asset_index):
+    by_name, candidates, _ = asset_index
+    if "krx_stock_master.parquet" in by_name:
+        return by_name["krx_stock_master.parquet"]
     for a in candidates:
-        if "krx_stock_master" in (a.get("name", "").lower()):
+        if _KRX_STOCK_MASTER_NAME_RE.search(a.get("name", "")):
             return a
     return None
 
+@st.cache_resource
+def _download_executor() -> ThreadPoolExecutor:
+    return ThreadPoolExecutor(max_workers=3, thread_name_prefix="asset-download")
+
+def _prefetch_release_assets(meta_asset, krx_master_asset, token=None) -> dict[str, Future]:
+    """
+    릴리즈 선택 직후 meta json / KRX master 다운로드를 병렬로 시작합니다.
+    결과는 각 loader의 st.cache_data에 저장되므로 이후 같은 loader 호출은 캐시에서 바로 반환됩니다.
+    Returns: {asset url: Future}
+    """
+    ctx = get_script_run_ctx()
+
+    def run(fn, *args):
+        # loader 내부의 st.error 등이 현재 세션에 표시되도록 script context 연결
+        add_script_run_ctx(threading.current_thread(), ctx)
+        return fn(*args)
+
+    executor = _download_executor()
+    futures: dict[str, Future] = {}
+    if meta_asset:
+        url = meta_asset["browser_download_url"]
+        futures[url] = executor.submit(run, load_json_from_url, url, token)
+    if krx_master_asset:
+        url = krx_master_asset["browser_download_url"]
+        futures[url] = executor.submit(run, load_parquet_table_from_url, url, token, None)
+    return futures
+
+def _await_prefetch(url: str) -> None:
+    """prefetch 중인 다운로드가 있으면 끝날 때까지 기다립니다 (중복 다운로드 방지)."""
+    future = (st.session_state.get("prefetch") or {}).get(url)
+    if future is not None:
+        wait([future])
+
 def _collect_meta_messages(obj: object, *, max_items: int = 30) -> list[tuple[str, str]]:
     """
     meta.json 내부의 error/last_error/notes 같은 메시지를 path와 함께 수집합니다.
@@ -691,19 +1287,51 @@ def _meta_health(meta: dict) -> tuple[list[str], list[str]]:
 
     return errors, warnings
 
+def _clear_caches() -> None:
+    """
+    강제 새로고침: st.cache_data, DuckDB connection(HTTP/parquet metadata 캐시), releases ETag, 로컬 Arrow 캐시와
+    이 세션에 로드된 데이터를 모두 비웁니다.
+    """
+    st.cache_data.clear()
+    get_duckdb_conn.clear()
+    _releases_cache().clear()
+    _etag_store().clear()
+    # 디렉터리는 CAPYBARA_CACHE_DIR로 공유될 수 있으므로 이 앱이 만든 *.arrow 파일만 지웁니다.
+    for p in _LOCAL_CACHE_DIR.glob("*.arrow"):
+        p.unlink(missing_ok=True)
+    for key in (
+        "krx_master_df", "krx_master_preview", "krx_master_ticker_index", "tickers_in_data",
+        "meta_obj", "meta_health", "prefetch", "prefetch_key",
+    ):
+        st.session_state.pop(key, None)
+
+if st.sidebar.button("Clear cache", help="다운로드/쿼리 캐시를 비우고 릴리즈 데이터를 다시 받습니다."):
+    _clear_caches()
+
 # 메인 로직
 if repo_name:
-    releases = get_releases(repo_name, github_token)
+    # 최신 RELEASES_PER_PAGE개부터 보여주고, 필요할 때만 이전 페이지를 추가로 조회
+    release_pages = st.session_state.get("release_pages", 1)
+    releases: list[dict] = []
+    has_older = False
+    for page in range(1, release_pages + 1):
+        page_releases, has_older = get_releases(repo_name, github_token, page)
+        releases.extend(page_releases)
+        if not has_older:
+            break
+    if has_older and st.sidebar.button("Show older releases"):
+        st.session_state["release_pages"] = release_pages + 1
+        st.rerun()
 
     if releases:
         st.write(f"✅ Found {len(releases)} releases.")
         
         # 릴리스 선택
-        release_options = {f"{r['name']} ({r['tag_name']})": r for r in releases}
-        selected_option = st.selectbox("Select Release", list(release_options.keys()))
+        release_labels, release_idx_by_label = _release_index(releases)
+        selected_option = st.selectbox("Select Release", release_labels)
         
         if selected_option:
-            selected_release = release_options[selected_option]
+            selected_release = releases[release_idx_by_label[selected_option]]
             
             with st.expander("Release Details", expanded=True):
                 st.markdown(f"**Created at:** {selected_release['created_at']}")
@@ -714,10 +1342,17 @@ if repo_name:
             assets = selected_release.get('assets', [])
 
             st.subheader("📦 Assets")
-            meta_asset = pick_meta_asset(assets)
-            feature_asset = pick_feature_asset(assets)
-            krx_master_asset = pick_krx_stock_master_asset(assets)
-            industry_asset = pick_industry_asset(assets)
+            asset_index = _index_assets(assets)
+            meta_asset = pick_meta_asset(asset_index)
+            feature_asset = pick_feature_asset(asset_index)
+            krx_master_asset = pick_krx_stock_master_asset(asset_index)
+            industry_asset = pick_industry_asset(asset_index)
+
+            # meta json / KRX master는 거의 항상 필요하므로 릴리즈 선택 시 병렬로 미리 받아둡니다.
+            prefetch_key = (selected_release.get("id"), github_token)
+            if st.session_state.get("prefetch_key") != prefetch_key:
+                st.session_state["prefetch"] = _prefetch_release_assets(meta_asset, krx_master_asset, github_token)
+                st.session_state["prefetch_key"] = prefetch_key
 
             # Keep loaded frames in session_state (so chart UI doesn't reset)
             if "krx_master_df" not in st.session_state:
@@ -729,12 +1364,19 @@ if repo_name:
             with st.expander("Metadata (meta.json)", expanded=False):
                 if meta_asset:
                     st.write(f"**Meta asset:** `{meta_asset['name']}`")
+                    _await_prefetch(meta_asset["browser_download_url"])
                     meta = load_json_from_url(meta_asset["browser_download_url"], github_token)
                     if meta:
-                        st.session_state["meta_obj"] = meta
-                        # show meta health banner (also outside this expander via session_state)
-                        errors, warnings = _meta_health(meta)
-                        st.session_state["meta_health"] = {"errors": errors, "warnings": warnings}
+                        # cache_data는 매번 새 객체를 돌려주므로, 내용이 같으면 기존 객체를 유지합니다
+                        # (session_state의 identity 기반 캐시(종목 목록 등)가 rerun 사이에 유지되도록).
+                        if meta != st.session_state.get("meta_obj"):
+                            st.session_state["meta_obj"] = meta
+                            # show meta health banner (also outside this expander via session_state)
+                            errors, warnings = _meta_health(meta)
+                            st.session_state["meta_health"] = {"errors": errors, "warnings": warnings}
+                        meta = st.session_state["meta_obj"]
+                        errors = st.session_state["meta_health"]["errors"]
+                        warnings = st.session_state["meta_health"]["warnings"]
                         col_a, col_b, col_c, col_d = st.columns(4)
                         col_a.metric("Start", meta.get("start_date", "-"))
                         col_b.metric("End", meta.get("end_date", "-"))
@@ -764,14 +1406,26 @@ if repo_name:
                     st.write(f"**Master asset:** `{krx_master_asset['name']}`")
                     if st.button("Load KRX Stock Master", key="load_krx_master"):
                         with st.spinner("Downloading KRX stock master..."):
-                            mdf = load_parquet_from_url(krx_master_asset["browser_download_url"], github_token)
+                            _await_prefetch(krx_master_asset["browser_download_url"])
+                            mdf = load_parquet_from_url(
+                                krx_master_asset["browser_download_url"], github_token, category_columns=KRX_MASTER_CATEGORY_COLUMNS
+                            )
                             if mdf is not None:
                                 st.success("KRX stock master loaded successfully!")
                                 st.session_state["krx_master_df"] = mdf
                     mdf_loaded = st.session_state.get("krx_master_df")
                     if mdf_loaded is not None:
                         st.write(f"**Loaded shape:** {mdf_loaded.shape}")
-                        st.dataframe(mdf_loaded.head(500), use_container_width=True)
+                        # 미리보기용 frame은 로드된 master가 바뀔 때만 다시 만듭니다 (expander를 닫아둬도 rerun마다 실행되므로)
+                        cached_preview = st.session_state.get("krx_master_preview")
+                        if cached_preview is None or cached_preview[0] is not mdf_loaded:
+                            cached_preview = (mdf_loaded, _downcast_for_display(mdf_loaded))
+                            st.session_state["krx_master_preview"] = cached_preview
+                        # 한 번에 한 페이지만 브라우저로 전송
+                        last_page = max(0, (len(mdf_loaded) - 1) // PREVIEW_PAGE_ROWS)
+                        page = st.number_input("Page", min_value=0, max_value=last_page, value=0, step=1, key="krx_master_page")
+                        start = int(page) * PREVIEW_PAGE_ROWS
+                        st.dataframe(cached_preview[1].iloc[start:start + PREVIEW_PAGE_ROWS], use_container_width=True)
                 else:
                     st.info("No `krx_stock_master.parquet` found in this release.")
 
@@ -787,7 +1441,7 @@ if repo_name:
             with st.expander("Industry Strength Data (parquet)", expanded=False):
                 if industry_asset:
                     st.write(f"**Industry asset:** `{industry_asset['name']}`")
-                    industry_meta_asset = find_meta_asset(assets, industry_asset["name"])
+                    industry_meta_asset = find_meta_asset(asset_index, industry_asset["name"])
                     if industry_meta_asset:
                         st.write(f"**Industry meta:** `{industry_meta_asset['name']}`")
                     st.info("Industry charts below query by industry/date without loading the whole file.")
@@ -805,7 +1459,10 @@ if repo_name:
                 master_df = st.session_state.get("krx_master_df")
                 if (master_df is None or master_df.empty) and krx_master_asset is not None:
                     with st.spinner("Loading KRX stock master for industry lists..."):
-                        mdf = load_parquet_from_url(krx_master_asset["browser_download_url"], github_token)
+                        _await_prefetch(krx_master_asset["browser_download_url"])
+                        mdf = load_parquet_from_url(
+                            krx_master_asset["browser_download_url"], github_token, category_columns=KRX_MASTER_CATEGORY_COLUMNS
+                        )
                         if mdf is not None and not mdf.empty:
                             st.session_state["krx_master_df"] = mdf
                             master_df = mdf
@@ -835,12 +1492,11 @@ if repo_name:
                 else:
                     min_d = pd.to_datetime(min_date).date()
                     max_d = pd.to_datetime(max_date).date()
-                    default_start = max(min_d, (pd.Timestamp(max_d) - pd.Timedelta(days=365)).date())
                     start_d, end_d = st.slider(
                         "Date range (Industry)",
                         min_value=min_d,
                         max_value=max_d,
-                        value=(default_start, max_d),
+                        value=_pick_default_date_window(min_d, max_d),
                         key="industry_date_range",
                     )
 
@@ -850,15 +1506,12 @@ if repo_name:
                         st.info("Top 5 industries not available (MansfieldRS may be NA in this range).")
                         top_df = pd.DataFrame(columns=["IndustryLarge", "IndustryMid", "IndustrySmall", "MansfieldRS", "ConstituentCount", "Date"])
 
-                    top_df = top_df.copy()
-                    top_df["Label"] = top_df.apply(
-                        lambda r: _industry_label(level, r["IndustryLarge"], r["IndustryMid"], r["IndustrySmall"]),
-                        axis=1,
-                    )
+                    # st.cache_data는 호출마다 새 frame을 돌려주므로 copy 없이 바로 컬럼을 추가합니다.
+                    top_df["Label"] = _industry_labels(level, top_df)
 
                     st.markdown("**Top 5 (as-of end date, sorted by MansfieldRS)**")
 
-                    top5_display_df = top_df[["Date", "Label", "MansfieldRS", "ConstituentCount"]].copy()
+                    top5_display_df = top_df[["Date", "Label", "MansfieldRS", "ConstituentCount"]]
                     top5_event = st.dataframe(
                         top5_display_df,
                         hide_index=True,
@@ -881,22 +1534,22 @@ if repo_name:
                             columns=["IndustryLarge", "IndustryMid", "IndustrySmall", "MansfieldRS", "ConstituentCount", "Date"]
                         )
 
-                    ranked_df = ranked_df.copy()
-                    ranked_df["Label"] = ranked_df.apply(
-                        lambda r: _industry_label(level, r["IndustryLarge"], r["IndustryMid"], r["IndustrySmall"]),
-                        axis=1,
+                    ranked_df["Label"] = _industry_labels(level, ranked_df)
+
+                    # Build selection options ordered by RS (ranked_df order); 같은 Label은 첫 행(RS 상위)만 사용
+                    ranked_uniq = ranked_df.drop_duplicates("Label")
+                    ranked_labels: list[str] = ranked_uniq["Label"].astype(str).tolist()
+                    label_to_tuple: dict[str, tuple[str, str, str]] = dict(
+                        zip(
+                            ranked_labels,
+                            zip(
+                                ranked_uniq["IndustryLarge"].astype(str),
+                                ranked_uniq["IndustryMid"].astype(str),
+                                ranked_uniq["IndustrySmall"].astype(str),
+                            ),
+                        )
                     )
 
-                    # Build selection options ordered by RS (ranked_df order)
-                    label_to_tuple: dict[str, tuple[str, str, str]] = {}
-                    ranked_labels: list[str] = []
-                    for _, r in ranked_df.iterrows():
-                        lab = str(r["Label"])
-                        tup = (str(r["IndustryLarge"]), str(r["IndustryMid"]), str(r["IndustrySmall"]))
-                        if lab not in label_to_tuple:
-                            label_to_tuple[lab] = tup
-                            ranked_labels.append(lab)
-
                     top_labels = top_df["Label"].tolist() if include_top5 else []
                     top_label_set = set(top_labels)
 
@@ -917,8 +1570,8 @@ if repo_name:
                     if not labels_to_plot:
                         st.info("No industries selected for chart.")
                     else:
-                        # Query time series per selected industry and plot MansfieldRS only
-                        series_frames: list[pd.DataFrame] = []
+                        # Resolve selected labels to industry keys, then query all of them in one scan
+                        resolved: list[tuple[str, tuple[str, str, str]]] = []
                         for lab in labels_to_plot:
                             tup = None
                             if lab in label_to_tuple:
@@ -929,32 +1582,40 @@ if repo_name:
                                 if not row.empty:
                                     r0 = row.iloc[0]
                                     tup = (str(r0["IndustryLarge"]), str(r0["IndustryMid"]), str(r0["IndustrySmall"]))
-                            if tup is None:
-                                continue
-                            a, b, c = tup
-                            one = query_industry_parquet(
-                                industry_url,
-                                level,
-                                a,
-                                b,
-                                c,
-                                start_d,
-                                end_d,
-                                ("Date", "MansfieldRS", "ConstituentCount"),
-                            )
+                            if tup is not None:
+                                resolved.append((lab, tup))
+
+                        all_series = query_industries_parquet(
+                            industry_url,
+                            level,
+                            tuple(dict.fromkeys(tup for _, tup in resolved)),
+                            start_d,
+                            end_d,
+                            ("Date", "MansfieldRS", "ConstituentCount"),
+                        )
+                        series_by_industry = {
+                            tuple(str(v) for v in key): g
+                            for key, g in all_series.groupby(["IndustryLarge", "IndustryMid", "IndustrySmall"], sort=False)
+                        }
+
+                        # Plot MansfieldRS only
+                        series_frames: list[pd.DataFrame] = []
+                        for lab, tup in resolved:
+                            one = series_by_industry.get(tup)
                             if one is None or one.empty:
                                 continue
-                            one["Date"] = _ensure_datetime(one["Date"])
-                            one["MansfieldRS"] = pd.to_numeric(one["MansfieldRS"], errors="coerce")
-                            one["ConstituentCount"] = pd.to_numeric(one["ConstituentCount"], errors="coerce")
+                            one = one.assign(
+                                MansfieldRS=pd.to_numeric(one["MansfieldRS"], errors="coerce"),
+                                ConstituentCount=pd.to_numeric(one["ConstituentCount"], errors="coerce"),
+                                Industry=lab,
+                            )
                             one = one.dropna(subset=["Date"]).sort_values("Date")
-                            one["Industry"] = lab
                             series_frames.append(one[["Date", "Industry", "MansfieldRS", "ConstituentCount"]])
 
                         if not series_frames:
                             st.warning("No data to plot for selected industries.")
                         else:
-                            plot_df = pd.concat(series_frames, ignore_index=True)
+                            plot_df = _downcast_for_chart(pd.concat(series_frames, ignore_index=True))
                             chart = (
                                 alt.Chart(plot_df)
                                 .mark_line()
@@ -986,27 +1647,18 @@ if repo_name:
                             try:
                                 # KRX stock master에서 업종으로 필터링
                                 if master_df is not None and not master_df.empty and "Code" in master_df.columns:
-                                    master_copy = master_df.copy()
-                                    master_copy["Code"] = master_copy["Code"].astype(str)
-                                    
-                                    # ETF 종목 제외 (업종 강도 계산에서)
-                                    if "Market" in master_copy.columns:
-                                        master_copy = master_copy[master_copy["Market"] != "ETF"]
-                                    
+                                    # 전체 master를 복사하지 않고 mask로 업종 종목만 골라낸 뒤 그 부분만 복사합니다.
+                                    codes = master_df["Code"].astype(str)
+                                    mask = master_df["IndustryLarge"] == industry_large
                                     # 업종 필터링 (level에 따라 다르게)
-                                    if level == "L":
-                                        filtered = master_copy[master_copy["IndustryLarge"] == industry_large]
-                                    elif level == "LM":
-                                        filtered = master_copy[
-                                            (master_copy["IndustryLarge"] == industry_large) &
-                                            (master_copy["IndustryMid"] == industry_mid)
-                                        ]
-                                    else:  # LMS
-                                        filtered = master_copy[
-                                            (master_copy["IndustryLarge"] == industry_large) &
-                                            (master_copy["IndustryMid"] == industry_mid) &
-                                            (master_copy["IndustrySmall"] == industry_small)
-                                        ]
+                                    if level in ("LM", "LMS"):
+                                        mask &= master_df["IndustryMid"] == industry_mid
+                                    if level == "LMS":
+                                        mask &= master_df["IndustrySmall"] == industry_small
+                                    # ETF 종목 제외 (업종 강도 계산에서)
+                                    if "Market" in master_df.columns:
+                                        mask &= master_df["Market"] != "ETF"
+                                    filtered = master_df[mask].assign(Code=codes[mask])
                                     
                                     tickers_list = filtered["Code"].tolist()
                                     
@@ -1021,10 +1673,9 @@ if repo_name:
                                         
                                         if tickers_rs_df is not None and not tickers_rs_df.empty:
                                             # KRX stock master와 조인하여 종목명 추가
-                                            tickers_rs_df = tickers_rs_df.copy()
                                             tickers_rs_df["Ticker"] = tickers_rs_df["Ticker"].astype(str)
                                             tickers_rs_df = tickers_rs_df.merge(
-                                                master_copy[["Code", "Name", "Market"]],
+                                                filtered[["Code", "Name", "Market"]],
                                                 left_on="Ticker",
                                                 right_on="Code",
                                                 how="left",
@@ -1033,7 +1684,7 @@ if repo_name:
                                             display_cols = ["Ticker", "Name", "Market", "MansfieldRS", "Date"]
 
                                             # 종목 선택 + 선택 종목 차트(종가+RS)
-                                            table_df = tickers_rs_df[display_cols].copy()
+                                            table_df = tickers_rs_df[display_cols]
                                             top10_event = st.dataframe(
                                                 table_df,
                                                 hide_index=True,
@@ -1078,22 +1729,22 @@ if repo_name:
                                                 if ts is None or ts.empty:
                                                     st.info("선택한 종목의 데이터가 선택 기간에 없습니다.")
                                                 else:
-                                                    ts = ts.copy()
-                                                    ts["Date"] = _ensure_datetime(ts["Date"])
                                                     ts["Close"] = pd.to_numeric(ts["Close"], errors="coerce")
                                                     if rs_col and rs_col in ts.columns:
                                                         ts[rs_col] = pd.to_numeric(ts[rs_col], errors="coerce")
 
+                                                    ts = _downcast_for_chart(ts)
+
                                                     st.markdown(f"**📈 `{selected_ticker}` 종가**")
                                                     price_chart = (
-                                                        alt.Chart(ts)
+                                                        alt.Chart(ts[["Date", "Close"]])
                                                         .mark_line()
                                                         .encode(
                                                             x=alt.X("Date:T", title="Date"),
                                                             y=alt.Y("Close:Q", title="Close"),
                                                             tooltip=[
                                                                 alt.Tooltip("Date:T"),
-                                                                alt.Tooltip("Close:Q"),
+                                                                alt.Tooltip("Close:Q", format=TOOLTIP_NUMBER_FORMAT),
                                                             ],
                                                         )
                                                     )
@@ -1101,7 +1752,7 @@ if repo_name:
 
                                                     if rs_col and rs_col in ts.columns:
                                                         st.markdown(f"**📉 RS (`{rs_col}`)**")
-                                                        rs_base = ts[["Date", rs_col]].copy()
+                                                        rs_base = ts[["Date", rs_col]]
                                                         rs_line = (
                                                             alt.Chart(rs_base)
                                                             .mark_line()
@@ -1110,7 +1761,7 @@ if repo_name:
                                                                 y=alt.Y(f"{rs_col}:Q", title=rs_col),
                                                                 tooltip=[
                                                                     alt.Tooltip("Date:T"),
-                                                                    alt.Tooltip(f"{rs_col}:Q", title=rs_col),
+                                                                    alt.Tooltip(f"{rs_col}:Q", title=rs_col, format=TOOLTIP_NUMBER_FORMAT),
                                                                 ],
                                                             )
                                                         )
@@ -1138,40 +1789,51 @@ if repo_name:
                 master_df = st.session_state.get("krx_master_df")
                 if (master_df is None or master_df.empty) and krx_master_asset is not None:
                     with st.spinner("Loading KRX stock master for market/industry info..."):
-                        mdf = load_parquet_from_url(krx_master_asset["browser_download_url"], github_token)
+                        _await_prefetch(krx_master_asset["browser_download_url"])
+                        mdf = load_parquet_from_url(
+                            krx_master_asset["browser_download_url"], github_token, category_columns=KRX_MASTER_CATEGORY_COLUMNS
+                        )
                         if mdf is not None and not mdf.empty:
                             st.session_state["krx_master_df"] = mdf
                             master_df = mdf
 
-                meta_obj = st.session_state.get("meta_obj") or {}
-                tickers_in_data = [str(t) for t in (meta_obj.get("tickers") or [])]
-                if not tickers_in_data and master_df is not None and "Code" in master_df.columns:
-                    tickers_in_data = sorted(master_df["Code"].astype(str).unique().tolist())
-
-                options = None
+                # 종목 목록은 meta/master가 바뀔 때만 다시 만듭니다 (rerun마다 str 변환/정렬하지 않도록)
+                raw_meta = st.session_state.get("meta_obj")
+                meta_obj = raw_meta or {}
+                cached_tickers = st.session_state.get("tickers_in_data")
+                if cached_tickers is None or cached_tickers[0] is not raw_meta or cached_tickers[1] is not master_df:
+                    tickers_in_data = [str(t) for t in (meta_obj.get("tickers") or [])]
+                    if not tickers_in_data and master_df is not None and "Code" in master_df.columns:
+                        tickers_in_data = sorted(master_df["Code"].astype(str).unique().tolist())
+                    cached_tickers = (raw_meta, master_df, tickers_in_data)
+                    st.session_state["tickers_in_data"] = cached_tickers
+                tickers_in_data = cached_tickers[2]
+
+                ticker_index = None
                 if master_df is not None and not master_df.empty and "Code" in master_df.columns:
-                    mv = master_df.copy()
-                    mv["Code"] = mv["Code"].astype(str)
-                    if tickers_in_data:
-                        mv = mv[mv["Code"].isin(tickers_in_data)]
-                    mv = mv.rename(columns={"Code": "Ticker"})
-                    options = mv.to_dict(orient="records")
-
-                if options is not None:
+                    # 종목 선택지/라벨/종목 정보는 master(또는 종목 목록)가 바뀔 때만 다시 만듭니다.
+                    cached_index = st.session_state.get("krx_master_ticker_index")
+                    if cached_index is None or cached_index[0] is not master_df or cached_index[1] is not tickers_in_data:
+                        cached_index = (master_df, tickers_in_data, _build_ticker_index(master_df, tickers_in_data))
+                        st.session_state["krx_master_ticker_index"] = cached_index
+                    ticker_index = cached_index[2]
+
+                if ticker_index is not None:
+                    ticker_choices, ticker_labels, ticker_info = ticker_index
                     search = st.text_input("Search (Ticker or Name)", value="")
                     if search:
                         s = search.strip().lower()
-                        options = [
-                            o
-                            for o in options
-                            if s in str(o.get("Ticker", "")).lower() or s in str(o.get("Name", "")).lower()
-                        ]
-                    selected = st.selectbox(
+                        hit = ticker_choices["_t_lc"].str.contains(s, regex=False) | ticker_choices["_n_lc"].str.contains(s, regex=False)
+                        ticker_choices = ticker_choices[hit]
+                        ticker_labels = ticker_labels[hit]
+                    # 표시 문자열은 미리 만들어 두고 selectbox는 위치(int)만 주고받습니다.
+                    ticker_labels = ticker_labels.tolist()
+                    selected_pos = st.selectbox(
                         "Select Ticker",
-                        options,
-                        format_func=lambda o: f"{o.get('Ticker','')} - {o.get('Name','')} ({o.get('Market','')})",
+                        range(len(ticker_labels)),
+                        format_func=ticker_labels.__getitem__,
                     )
-                    selected_ticker = str(selected.get("Ticker", ""))
+                    selected_ticker = str(ticker_choices["Ticker"].iloc[selected_pos]) if selected_pos is not None else ""
                 else:
                     st.info("KRX stock master not available. (Ticker-only selection)")
                     search = st.text_input("Search (Ticker)", value="")
@@ -1185,81 +1847,18 @@ if repo_name:
                     st.warning("No ticker selected.")
                 else:
                     # Show selected ticker market/industry info (if available)
-                    if master_df is not None and not master_df.empty and "Code" in master_df.columns:
-                        mv = master_df.copy()
-                        mv["Code"] = mv["Code"].astype(str)
-                        row = mv[mv["Code"] == selected_ticker]
-                        if not row.empty:
-                            r0 = row.iloc[0].to_dict()
+                    if ticker_index is not None:
+                        r0 = ticker_index[2].get(selected_ticker)
+                        if r0 is not None:
                             st.markdown(
                                 f"**Selected**: `{selected_ticker}` - {r0.get('Name','')} "
                                 f"(**{r0.get('Market','')}**)\n\n"
                                 f"- **Industry (L/M/S)**: {r0.get('IndustryLarge','')} / {r0.get('IndustryMid','')} / {r0.get('IndustrySmall','')}"
                             )
 
-                    try:
-                        min_date, max_date = query_feature_date_bounds(feature_url, selected_ticker)
-                    except Exception as e:
-                        st.error(f"Failed to query date bounds (likely URL/access issue): {e}")
-                        min_date, max_date = None, None
-
-                    if min_date is None or max_date is None:
-                        st.warning("No data available for selected ticker.")
-                    else:
-                        min_d = pd.to_datetime(min_date).date()
-                        max_d = pd.to_datetime(max_date).date()
-                        default_start = max(min_d, (pd.Timestamp(max_d) - pd.Timedelta(days=365)).date())
-                        start_d, end_d = st.slider("Date range", min_value=min_d, max_value=max_d, value=(default_start, max_d))
-
-                        show_newhigh = st.checkbox("Show 1Y New High markers", value=False)
-                        # Marker position is fixed to Close (UI removed)
-                        marker_pos = "Close"
-
-                        tab_line, tab_candle = st.tabs(["Close & Metrics (Line)", "Candlestick (OHLC)"])
-
-                        all_cols = meta_obj.get("columns") or []
-                        numeric_candidates = [c for c in all_cols if c not in {"Date", "Ticker"}]
-
-                        with tab_line:
-                            extra = st.multiselect(
-                                "Additional numeric metrics (Close is always shown)",
-                                options=[c for c in numeric_candidates if c != "Close"],
-                                default=[],
-                            )
-                            metrics = ["Close"] + [c for c in extra if c != "Close"]
-                            need_cols = tuple(["Date", "Ticker"] + sorted(set(metrics + ["IsNewHigh1Y", marker_pos])))
-                            one = query_feature_parquet(feature_url, selected_ticker, start_d, end_d, need_cols)
-                            if one.empty:
-                                st.warning("No data in selected date range.")
-                            else:
-                                one["Date"] = _ensure_datetime(one["Date"])
-                                marker_y_col = "Close"
-                                newhigh_layer = _build_newhigh_marker_layer(one, "Date", marker_y_col) if show_newhigh else None
-                                left_cols, right_cols = _axis_assignment(one, "Close", [c for c in metrics if c != "Close"])
-                                chart = _build_dual_axis_chart(one, "Date", ["Close"] + [c for c in left_cols if c != "Close"], right_cols, marker_layer=newhigh_layer)
-                                st.altair_chart(chart, use_container_width=True)
-
-                        with tab_candle:
-                            extra = st.multiselect(
-                                "Additional numeric metrics to overlay",
-                                options=[c for c in numeric_candidates if c not in {"Open", "High", "Low", "Close"}],
-                                default=[],
-                                key="candle_extra_metrics",
-                            )
-                            metrics = [c for c in extra if c != "Close"]
-                            need_cols = tuple(["Date", "Ticker", "Open", "High", "Low", "Close"] + sorted(set(metrics + ["IsNewHigh1Y", marker_pos])))
-                            one = query_feature_parquet(feature_url, selected_ticker, start_d, end_d, need_cols)
-                            if one.empty:
-                                st.warning("No data in selected date range.")
-                            else:
-                                one["Date"] = _ensure_datetime(one["Date"])
-                                marker_y_col = "Close"
-                                newhigh_layer = _build_newhigh_marker_layer(one, "Date", marker_y_col) if show_newhigh else None
-                                candle = _build_candlestick_with_metrics(one, "Date", metrics, marker_layer=newhigh_layer)
-                                if candle is None:
-                                    st.info("Could not build candlestick chart for this data.")
-                                else:
-                                    st.altair_chart(candle, use_container_width=True)
+                    all_cols = meta_obj.get("columns") or []
+                    numeric_candidates = [c for c in all_cols if c not in {"Date", "Ticker"}]
+                    _ticker_chart_section(feature_url, selected_ticker, numeric_candidates)
     else:
         if repo_name != default_repo:
             st.info("No releases found. Please check the repository name or token.")
@@ -0,0 +1,37 @@
+"""Tests for pure helper functions in streamlit_app.py.
+
+streamlit_app.py runs the whole app at import time, so the helpers under test
+are extracted from its source and executed in an isolated namespace.
+"""
+import ast
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+APP_PATH = Path(__file__).parent.parent / "streamlit_app.py"
+
+
+def _load_helpers(*names):
+    tree = ast.parse(APP_PATH.read_text(encoding="utf-8"))
+    nodes = [n for n in tree.body if isinstance(n, ast.FunctionDef) and n.name in names]
+    assert {n.name for n in nodes} == set(names)
+    namespace = {"np": np, "pd": pd}
+    exec(compile(ast.Module(body=nodes, type_ignores=[]), str(APP_PATH), "exec"), namespace)
+    return [namespace[name] for name in names]
+
+
+def test_ensure_datetime_int64_epoch_ns():
+    (_ensure_datetime,) = _load_helpers("_ensure_datetime")
+    ts = pd.Timestamp("2024-01-02")
+    result = _ensure_datetime(pd.Series([ts.value], dtype="int64"))
+    assert pd.api.types.is_datetime64_any_dtype(result)
+    assert result.iloc[0] == ts
+
+
+def test_ensure_datetime_nullable_int_with_na():
+    (_ensure_datetime,) = _load_helpers("_ensure_datetime")
+    result = _ensure_datetime(pd.Series([1, pd.NA], dtype="Int64"))
+    assert pd.api.types.is_datetime64_any_dtype(result)
+    assert result.iloc[0] == pd.Timestamp(1)
+    assert pd.isna(result.iloc[1])
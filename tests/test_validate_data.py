@@ -17,7 +17,9 @@ from validate_data import (
     validate_parquet_readable,
     validate_universe_data_structure,
     validate_data_quality,
+    _column_min_max,
     validate_no_duplicates,
+    validate_date_coverage,
     validate_krx_master,
     validate_industry_data,
 )
@@ -221,6 +223,50 @@ def test_validate_data_quality_negative_volume():
         validate_data_quality(df)
 
 
+def test_validate_data_quality_uses_parquet_statistics(tmp_path):
+    """Test data quality validation reads Close/Volume ranges from parquet statistics."""
+    parquet_file = tmp_path / "universe.parquet"
+    file_df = pd.DataFrame({
+        "Date": pd.date_range("2025-01-01", periods=100),
+        "Ticker": ["005930"] * 100,
+        "Close": [-10] + list(range(100, 199)),  # Negative price only in the file
+        "Volume": [1000] * 100,
+    })
+    file_df.to_parquet(parquet_file, row_group_size=25)
+    assert _column_min_max(parquet_file, "Close") == (-10, 198)
+    assert _column_min_max(parquet_file, "Missing") is None
+    
+    # The in-memory frame is clean, so the error can only come from file statistics
+    df = file_df.assign(Close=range(100, 200))
+    validate_data_quality(df)
+    with pytest.raises(ValidationError, match=r"invalid values <= 0: min=-10"):
+        validate_data_quality(df, parquet_file)
+
+
+def test_validate_data_quality_negative_volume_with_path(tmp_path):
+    """Test negative volume is still detected when statistics are consulted."""
+    df = pd.DataFrame({
+        "Date": pd.date_range("2025-01-01", periods=100),
+        "Ticker": ["005930"] * 100,
+        "Close": range(100, 200),
+        "Volume": [1000] * 99 + [-1],
+    })
+    
+    # Statistics show a negative minimum, so the column is scanned and counted
+    negative_file = tmp_path / "negative.parquet"
+    df.to_parquet(negative_file, row_group_size=25)
+    assert _column_min_max(negative_file, "Volume") == (-1, 1000)
+    with pytest.raises(ValidationError, match="1 negative values"):
+        validate_data_quality(df, negative_file)
+    
+    # Non-negative statistics pass without scanning the column: the negative
+    # value that exists only in the in-memory frame is never looked at
+    clean_file = tmp_path / "clean.parquet"
+    df.assign(Volume=1000).to_parquet(clean_file, row_group_size=25)
+    assert _column_min_max(clean_file, "Volume") == (1000, 1000)
+    validate_data_quality(df, clean_file)
+
+
 def test_validate_no_duplicates_success():
     """Test duplicate validation passes."""
     df = pd.DataFrame({
@@ -245,6 +291,30 @@ def test_validate_no_duplicates_failure():
         validate_no_duplicates(df)
 
 
+def test_validate_no_duplicates_counts_duplicate_rows():
+    """Test duplicate validation reports every row in a duplicated Date+Ticker group."""
+    df = pd.DataFrame({
+        "Date": pd.to_datetime(["2025-01-01", "2025-01-01", "2025-01-01"]),
+        "Ticker": ["005930", "000660", "005930"],  # Duplicate Date+Ticker
+        "Close": [100, 200, 105],
+    })
+    
+    with pytest.raises(ValidationError, match="Found 2 duplicate"):
+        validate_no_duplicates(df)
+
+
+def test_validate_date_coverage():
+    """Test date coverage validation for datetime and string dates."""
+    df = pd.DataFrame({"Date": pd.date_range("2025-01-01", periods=60), "Ticker": ["005930"] * 60})
+    
+    # Should not raise
+    validate_date_coverage(df, {})
+    validate_date_coverage(pd.DataFrame({"Date": ["2025-01-01", "2025-03-01", None]}), {})
+    
+    with pytest.raises(ValidationError, match="No valid dates"):
+        validate_date_coverage(pd.DataFrame({"Date": [None, None]}), {})
+
+
 def test_validate_krx_master_success(tmp_path):
     """Test KRX master validation passes."""
     master_file = tmp_path / "krx_stock_master.parquet"
@@ -353,3 +423,9 @@ def test_validation_script_integration(tmp_path):
     # Check that stderr contains the expected error about file size or ticker count
     assert "file size too small" in result.stderr or "Ticker count too low" in result.stderr, \
         f"Expected validation error in stderr, got: {result.stderr}"
+    
+    # Concurrent validators still print their output as ordered, contiguous blocks
+    steps = [result.stderr.index(f"[{n}/5]") for n in range(1, 6)]
+    assert steps == sorted(steps)
+    assert steps[0] < result.stderr.index("✗ Universe validation failed") < steps[1]
+    assert steps[1] < result.stderr.index("⊘ Industry data not present") < steps[2]